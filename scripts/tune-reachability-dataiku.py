@@ -7,6 +7,7 @@ How to use in Dataiku:
 1) Upload dimensions.json, questions.json, results.json into INPUT managed folder.
 2) Set INPUT_FOLDER_ID and OUTPUT_FOLDER_ID below.
 3) Run this as a Python recipe (or notebook cell).
+4) Optional: set BATCH_MANIFEST_FILE to tune several quiz variants in one run.
 
 Hard stop guards prevent endless loops:
 - MAX_SECONDS
@@ -16,7 +17,11 @@ Hard stop guards prevent endless loops:
 
 from __future__ import annotations
 
+import collections
+import concurrent.futures
+import contextlib
 import copy
+import hashlib
 import io
 import json
 import math
@@ -29,6 +34,16 @@ try:
 except Exception:
     dataiku = None
 
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None
+
+try:
+    import numba  # type: ignore
+except Exception:
+    numba = None
+
 
 CONFIG = {
     # Dataiku managed folders
@@ -40,6 +55,14 @@ CONFIG = {
     "OUTPUT_QUESTIONS_FILE": "questions.tuned.json",
     "OUTPUT_SUMMARY_FILE": "tuning.summary.json",
 
+    # Batch mode: a manifest of {"variants": [{"id", "dimensions", "questions", "results", "config"}]}
+    # tunes every variant on one worker pool; outputs go to <id>/ plus a combined report
+    "BATCH_MANIFEST_FILE": "",
+    "LOCAL_BATCH_MANIFEST_PATH": "",
+    "OUTPUT_BATCH_REPORT_FILE": "tuning.batch.report.json",
+    "BATCH_WORKERS": 0,
+    "BATCH_SLICE_SECONDS": 60,  # <= 0 runs each variant to completion in one slice
+
     # Local fallback paths (used if Dataiku is unavailable)
     "LOCAL_DIMENSIONS_PATH": "data/dimensions.json",
     "LOCAL_QUESTIONS_PATH": "data/questions.json",
@@ -61,11 +84,42 @@ CONFIG = {
     "SEARCH_ITERATIONS": 8000,
     "ANSWER_MUTATION_SPAN": 2,
 
+    # Adaptive search budget, split across targets per attempt
+    # (set both budgets to 0 to give every target the fixed RESTARTS x ITERATIONS)
+    "SEARCH_BUDGET_ITERATIONS": 256000,
+    "SEARCH_BUDGET_SECONDS": 0,
+    "SEARCH_BUDGET_MIN_ITERATIONS": 500,
+    "SEARCH_DIFFICULTY_DECAY": 0.5,
+
+    # Answer search engine: "compiled" (numba kernels), "batched" (numpy lockstep chains) or "scalar".
+    # "auto" prefers compiled, then batched, then scalar; an unavailable choice falls back the same way.
+    "SEARCH_ENGINE": "auto",
+    "SEARCH_CHAINS": 256,
+
+    # Compiled kernels: "auto" uses numba when installed and parity-checked, "python" forces the reference code
+    "KERNEL_BACKEND": "auto",
+    "KERNEL_PARITY_SAMPLES": 2000,
+
+    # Pure-Python path: score answers with one biased big-int lane per dimension
+    "PACKED_SCORES": True,
+
     # Weight mutation
     "WEIGHT_MUTATION_COUNT": 8,
     "WEIGHT_MUTATION_STEP": 3,
     "WEIGHT_LIMIT": 20,
 
+    # Surrogate pre-screening of weight mutations
+    "SURROGATE_ENABLED": False,
+    "SURROGATE_PROPOSALS": 16,
+    "SURROGATE_WARMUP": 20,
+    "SURROGATE_EXPLORE_RATE": 0.15,
+    "SURROGATE_LEARNING_RATE": 0.5,
+
+    # Transposition table for revisited matrices (0 disables);
+    # POOL_SAMPLES > 0 tops up cached distributions with fresh samples up to that many
+    "TRANSPOSITION_TABLE_SIZE": 4096,
+    "TRANSPOSITION_POOL_SAMPLES": 0,
+
     # Probability estimation
     "PROBABILITY_SAMPLES": 20000,
     "PROBABILITY_WEIGHT": 1.0,
@@ -90,58 +144,40 @@ def is_dataiku_mode() -> bool:
     return bool(dataiku and CONFIG["INPUT_FOLDER_ID"] and CONFIG["OUTPUT_FOLDER_ID"])
 
 
-def read_json_payloads() -> tuple[dict, dict, dict]:
+def read_json_input(name: str, local_path: str) -> dict:
     if is_dataiku_mode():
         folder = dataiku.Folder(CONFIG["INPUT_FOLDER_ID"])
+        with folder.get_download_stream(name) as stream:
+            return json.load(io.TextIOWrapper(stream, encoding="utf-8"))
 
-        def read_one(name: str) -> dict:
-            with folder.get_download_stream(name) as stream:
-                return json.load(io.TextIOWrapper(stream, encoding="utf-8"))
+    with open(local_path, "r", encoding="utf-8") as f:
+        return json.load(f)
 
-        return (
-            read_one(CONFIG["DIMENSIONS_FILE"]),
-            read_one(CONFIG["QUESTIONS_FILE"]),
-            read_one(CONFIG["RESULTS_FILE"]),
-        )
 
-    with open(CONFIG["LOCAL_DIMENSIONS_PATH"], "r", encoding="utf-8") as f:
-        dims = json.load(f)
-    with open(CONFIG["LOCAL_QUESTIONS_PATH"], "r", encoding="utf-8") as f:
-        questions = json.load(f)
-    with open(CONFIG["LOCAL_RESULTS_PATH"], "r", encoding="utf-8") as f:
-        results = json.load(f)
-    return dims, questions, results
+def read_json_payloads() -> tuple[dict, dict, dict]:
+    return (
+        read_json_input(CONFIG["DIMENSIONS_FILE"], CONFIG["LOCAL_DIMENSIONS_PATH"]),
+        read_json_input(CONFIG["QUESTIONS_FILE"], CONFIG["LOCAL_QUESTIONS_PATH"]),
+        read_json_input(CONFIG["RESULTS_FILE"], CONFIG["LOCAL_RESULTS_PATH"]),
+    )
 
 
-def write_outputs(tuned_questions: dict, summary: dict) -> None:
+def write_json_output(name: str, payload: dict) -> None:
     if is_dataiku_mode():
         folder = dataiku.Folder(CONFIG["OUTPUT_FOLDER_ID"])
-        folder.upload_data(
-            CONFIG["OUTPUT_QUESTIONS_FILE"],
-            (json.dumps(tuned_questions, indent=2) + "\n").encode("utf-8"),
-        )
-        folder.upload_data(
-            CONFIG["OUTPUT_SUMMARY_FILE"],
-            (json.dumps(summary, indent=2) + "\n").encode("utf-8"),
-        )
+        folder.upload_data(name, (json.dumps(payload, indent=2) + "\n").encode("utf-8"))
         return
 
-    os.makedirs(CONFIG["LOCAL_OUTPUT_DIR"], exist_ok=True)
-    with open(
-        os.path.join(CONFIG["LOCAL_OUTPUT_DIR"], CONFIG["OUTPUT_QUESTIONS_FILE"]),
-        "w",
-        encoding="utf-8",
-    ) as f:
-        json.dump(tuned_questions, f, indent=2)
+    path = os.path.join(CONFIG["LOCAL_OUTPUT_DIR"], name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
         f.write("\n")
 
-    with open(
-        os.path.join(CONFIG["LOCAL_OUTPUT_DIR"], CONFIG["OUTPUT_SUMMARY_FILE"]),
-        "w",
-        encoding="utf-8",
-    ) as f:
-        json.dump(summary, f, indent=2)
-        f.write("\n")
+
+def write_outputs(tuned_questions: dict, summary: dict, prefix: str = "") -> None:
+    write_json_output(prefix + CONFIG["OUTPUT_QUESTIONS_FILE"], tuned_questions)
+    write_json_output(prefix + CONFIG["OUTPUT_SUMMARY_FILE"], summary)
 
 
 def normalize_condition(cond: dict, dim_index: dict[str, int]) -> dict:
@@ -203,6 +239,51 @@ def matrix_to_questions_file(original: dict, matrix: list[list[list[int]]], dime
 def clone_matrix(matrix: list[list[list[int]]]) -> list[list[list[int]]]:
     return [[opt[:] for opt in q] for q in matrix]
 
+
+def undo_weight_edits(matrix: list[list[list[int]]], edits: list[tuple]) -> None:
+    for qi, oi, di, old, _ in reversed(edits):
+        matrix[qi][oi][di] = old
+
+
+def redo_weight_edits(matrix: list[list[list[int]]], edits: list[tuple]) -> None:
+    for qi, oi, di, _, new in edits:
+        matrix[qi][oi][di] = new
+
+
+def record_weight_delta(delta: dict, base: list[list[list[int]]], edits: list[tuple]) -> None:
+    for qi, oi, di, _, new in edits:
+        if new == base[qi][oi][di]:
+            delta.pop((qi, oi, di), None)
+        else:
+            delta[(qi, oi, di)] = new
+
+
+def apply_weight_delta(base: list[list[list[int]]], delta: dict) -> list[list[list[int]]]:
+    out = clone_matrix(base)
+    for (qi, oi, di), value in delta.items():
+        out[qi][oi][di] = value
+    return out
+
+
+def replay_delta_log(base: list[list[list[int]]], log: list[list[int]], until_attempt: int | None = None) -> list[list[list[int]]]:
+    out = clone_matrix(base)
+    for attempt, qi, oi, di, _, new in log:
+        if until_attempt is not None and attempt > until_attempt:
+            break
+        out[qi][oi][di] = new
+    return out
+
+
+ANSWER_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def encode_answers(answers: list[int]) -> str:
+    # one base-36 digit per question; questions with more options fall back to dot-separated indexes
+    if all(oi < len(ANSWER_DIGITS) for oi in answers):
+        return "".join(ANSWER_DIGITS[oi] for oi in answers)
+    return ".".join(str(oi) for oi in answers)
+
+
 def create_random_answers(matrix: list[list[list[int]]], rng: random.Random) -> list[int]:
     return [rng.randrange(len(q)) if q else 0 for q in matrix]
 
@@ -239,6 +320,48 @@ def score_answers(dim_count: int, matrix: list[list[list[int]]], answers: list[i
     return [int(clamp(round(v), SCORE_MIN, SCORE_MAX)) for v in scores]
 
 
+def pack_matrix(matrix: list[list[list[int]]], dim_count: int) -> dict:
+    # lanes are biased to be non-negative and wide enough that summing one option per question never carries
+    bias = max([int(CONFIG["WEIGHT_LIMIT"])] + [abs(v) for q in matrix for vec in q for v in vec[:dim_count]])
+    width = (2 * bias * max(1, len(matrix))).bit_length()
+    options = []
+    for q in matrix:
+        packed_q = []
+        for vec in q:
+            packed = 0
+            for di in range(dim_count):
+                packed |= ((vec[di] if di < len(vec) else 0) + bias) << (di * width)
+            packed_q.append(packed)
+        options.append(packed_q)
+    return {
+        "options": options,
+        "bias": bias,
+        "mask": (1 << width) - 1,
+        "shifts": [di * width for di in range(dim_count)],
+    }
+
+
+def score_answers_packed(packed: dict, answers: list[int]) -> list[int]:
+    options = packed["options"]
+    total = 0
+    answered = 0
+    for qi, oi in enumerate(answers):
+        if qi >= len(options) or oi < 0 or oi >= len(options[qi]):
+            continue
+        total += options[qi][oi]
+        answered += 1
+    mask = packed["mask"]
+    offset = answered * packed["bias"]
+    return [min(SCORE_MAX, max(SCORE_MIN, ((total >> shift) & mask) - offset)) for shift in packed["shifts"]]
+
+
+def answer_scorer(matrix: list[list[list[int]]], dim_count: int):
+    if CONFIG["PACKED_SCORES"]:
+        packed = pack_matrix(matrix, dim_count)
+        return lambda answers: score_answers_packed(packed, answers)
+    return lambda answers: score_answers(dim_count, matrix, answers)
+
+
 def summarize_scores(scores: list[int]) -> dict:
     ordered = sorted(
         [{"score": s, "dim": i} for i, s in enumerate(scores)],
@@ -388,33 +511,54 @@ def objective_for_target(target_i: int, winner_i: int, checks: list[dict], resul
     return passed * 1200.0 - failed * 1000.0 - target["totalGap"] * 85.0 - blockers * 1500.0
 
 
-def search_for_target(matrix: list[list[list[int]]], target_i: int, seed: int, dim_count: int, results: list[dict]) -> dict:
+def search_for_target(
+    matrix: list[list[list[int]]],
+    target_i: int,
+    seed: int,
+    dim_count: int,
+    results: list[dict],
+    max_iterations: int | None = None,
+    initial_answers: list[int] | None = None,
+    deadline: float | None = None,
+) -> dict:
     rng = random.Random(seed)
+    score = answer_scorer(matrix, dim_count)
     best_answers = create_random_answers(matrix, rng)
+    if initial_answers is not None:
+        best_answers = list(initial_answers)
     best_score = float("-inf")
+    budget = int(CONFIG["SEARCH_RESTARTS"]) * int(CONFIG["SEARCH_ITERATIONS"])
+    if max_iterations is not None:
+        budget = min(budget, max(0, int(max_iterations)))
+    used = 0
 
     for restart in range(CONFIG["SEARCH_RESTARTS"]):
+        if restart > 0 and (used >= budget or (deadline is not None and time.monotonic() >= deadline)):
+            break
         current = list(best_answers) if restart == 0 else create_random_answers(matrix, rng)
-        summary = summarize_scores(score_answers(dim_count, matrix, current))
+        summary = summarize_scores(score(current))
         evaluated = evaluate_results(summary, results)
         current_score = objective_for_target(target_i, evaluated["winnerIndex"], evaluated["checks"], results)
 
         if evaluated["winnerIndex"] == target_i:
-            return {"found": True, "bestScore": current_score, "bestAnswers": current}
+            return {"found": True, "bestScore": current_score, "bestAnswers": current, "iterations": used}
 
         if current_score > best_score:
             best_score = current_score
             best_answers = list(current)
 
         temperature = 1.0
-        for _ in range(CONFIG["SEARCH_ITERATIONS"]):
+        for step in range(min(int(CONFIG["SEARCH_ITERATIONS"]), budget - used)):
+            if deadline is not None and step % 256 == 255 and time.monotonic() >= deadline:
+                break
+            used += 1
             candidate = mutate_answers(current, matrix, rng, CONFIG["ANSWER_MUTATION_SPAN"])
-            s2 = summarize_scores(score_answers(dim_count, matrix, candidate))
+            s2 = summarize_scores(score(candidate))
             e2 = evaluate_results(s2, results)
             cscore = objective_for_target(target_i, e2["winnerIndex"], e2["checks"], results)
 
             if e2["winnerIndex"] == target_i:
-                return {"found": True, "bestScore": cscore, "bestAnswers": candidate}
+                return {"found": True, "bestScore": cscore, "bestAnswers": candidate, "iterations": used}
 
             if cscore > best_score:
                 best_score = cscore
@@ -428,18 +572,1077 @@ def search_for_target(matrix: list[list[list[int]]], target_i: int, seed: int, d
 
             temperature *= 0.9997
 
-    return {"found": False, "bestScore": best_score, "bestAnswers": best_answers}
+    return {"found": False, "bestScore": best_score, "bestAnswers": best_answers, "iterations": used}
+
+
+RULESET_CACHE: dict[str, dict] = {}
+
+
+def ruleset_digest(results: list[dict]) -> str:
+    payload = json.dumps(
+        [[r["id"], r["priority"], r["isFallback"], r["conditions"]] for r in results],
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def compiled_ruleset(results: list[dict]) -> dict:
+    # variants with identical rules share one entry, so each evaluator is compiled once per process
+    return RULESET_CACHE.setdefault(ruleset_digest(results), {})
+
+
+def ruleset_batch_rules(results: list[dict]) -> dict:
+    entry = compiled_ruleset(results)
+    if "batchRules" not in entry:
+        entry["batchRules"] = compile_batch_rules(results)
+    return entry["batchRules"]
+
+
+def ruleset_kernel_tables(results: list[dict]) -> dict:
+    entry = compiled_ruleset(results)
+    if "kernelTables" not in entry:
+        entry["kernelTables"] = encode_kernel_tables(results)
+    return entry["kernelTables"]
+
+
+def prepare_ruleset(results: list[dict]) -> None:
+    if np is None:
+        return
+    ruleset_kernel_tables(results)
+    if search_engine(results) == "batched":
+        ruleset_batch_rules(results)
+
+
+def search_engine(results: list[dict]) -> str:
+    available = {
+        "compiled": kernel_backend_active(results),
+        "batched": np is not None,
+        "scalar": True,
+    }
+    requested = str(CONFIG["SEARCH_ENGINE"]).lower()
+    if available.get(requested):
+        return requested
+    return next(name for name in ("compiled", "batched", "scalar") if available[name])
+
+
+def matrix_to_arrays(matrix: list[list[list[int]]], dim_count: int):
+    max_options = max((len(q) for q in matrix), default=1)
+    weights = np.zeros((len(matrix), max(1, max_options), dim_count), dtype=np.int64)
+    for qi, q in enumerate(matrix):
+        for oi, vec in enumerate(q):
+            n = min(len(vec), dim_count)
+            weights[qi, oi, :n] = vec[:n]
+    option_counts = np.array([len(q) for q in matrix], dtype=np.int64)
+    return weights, option_counts
+
+
+def compile_batch_rules(results: list[dict]) -> dict:
+    count = len(results)
+    standard = np.array([not r["isFallback"] for r in results], dtype=bool)
+    preference = sorted(range(count), key=lambda i: (-results[i]["priority"], i))
+    preference_rank = np.empty(count, dtype=np.int64)
+    preference_rank[preference] = np.arange(count)
+    outranked_by = np.array(
+        [[i != t and standard[i] and outranks(i, t, results) for i in range(count)] for t in range(count)],
+        dtype=bool,
+    )
+    return {
+        "count": count,
+        "standard": standard,
+        "hasStandard": bool(standard.any()),
+        "fallbackIndex": next((i for i, r in enumerate(results) if r["isFallback"]), None),
+        "priority": np.array([r["priority"] for r in results], dtype=np.float64),
+        "preferenceRank": preference_rank,
+        "totalCounts": np.array([len(r["conditions"]) for r in results], dtype=np.int64),
+        "outrankedBy": outranked_by,
+        "conditions": [(ri, cond) for ri, r in enumerate(results) for cond in r["conditions"]],
+    }
+
+
+def summarize_scores_batch(raw_scores) -> dict:
+    scores = np.clip(raw_scores, SCORE_MIN, SCORE_MAX)
+    rows = np.arange(scores.shape[0])
+    # stable sort on -score keeps the (-score, dim) tie-break of summarize_scores
+    order = np.argsort(-scores, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.broadcast_to(np.arange(1, scores.shape[1] + 1), order.shape), axis=1)
+    second_col = 1 if scores.shape[1] > 1 else 0
+    return {
+        "scores": scores,
+        "total": scores.sum(axis=1),
+        "spread": scores.max(axis=1) - scores.min(axis=1),
+        "topDim": order[:, 0],
+        "topScore": scores[rows, order[:, 0]],
+        "secondScore": scores[rows, order[:, second_col]],
+        "ranks": ranks,
+    }
+
+
+def condition_gap_batch(cond: dict, summary: dict):
+    scores = summary["scores"]
+    t = cond["type"]
+
+    if t == "min" or t == "max_ge":
+        return np.maximum(0.0, cond["value"] - scores[:, cond["dim"]])
+    if t == "max_le":
+        return np.maximum(0.0, scores[:, cond["dim"]] - cond["value"])
+    if t == "diff_greater":
+        diff = scores[:, cond["a"]] - scores[:, cond["b"]]
+        return np.where(diff > cond["value"], 0.0, cond["value"] - diff + 1.0)
+    if t == "diff_abs_lte":
+        diff = np.abs(scores[:, cond["a"]] - scores[:, cond["b"]])
+        return np.maximum(0.0, diff - cond["value"])
+    if t == "top_is":
+        return np.where(summary["topDim"] == cond["dim"], 0.0, 1.0)
+    if t == "not_top_is":
+        return np.where(summary["topDim"] != cond["dim"], 0.0, 1.0)
+    if t == "rank_is":
+        return np.abs(summary["ranks"][:, cond["dim"]] - cond["rank"]).astype(np.float64)
+    if t == "top_diff_gte":
+        return np.maximum(0.0, cond["value"] - (summary["topScore"] - summary["secondScore"]))
+    if t == "top_diff_lte":
+        return np.maximum(0.0, (summary["topScore"] - summary["secondScore"]) - cond["value"])
+    if t == "total_min":
+        return np.maximum(0.0, cond["value"] - summary["total"])
+    if t == "total_max":
+        return np.maximum(0.0, summary["total"] - cond["value"])
+    if t == "sum_min":
+        return np.maximum(0.0, cond["value"] - scores[:, cond["dims"]].sum(axis=1))
+    if t == "sum_max":
+        return np.maximum(0.0, scores[:, cond["dims"]].sum(axis=1) - cond["value"])
+    if t == "spread_between":
+        spread = summary["spread"]
+        return np.where(
+            spread < cond["min"],
+            cond["min"] - spread,
+            np.where(spread > cond["max"], spread - cond["max"], 0.0),
+        ).astype(np.float64)
+    return np.ones(scores.shape[0], dtype=np.float64)
+
+
+def evaluate_results_batch(summary: dict, rules: dict) -> dict:
+    chains = summary["scores"].shape[0]
+    gaps = np.zeros((chains, rules["count"]), dtype=np.float64)
+    passes = np.zeros((chains, rules["count"]), dtype=np.int64)
+    for ri, cond in rules["conditions"]:
+        gap = condition_gap_batch(cond, summary)
+        gaps[:, ri] += gap
+        passes[:, ri] += gap == 0
+
+    passed = passes == rules["totalCounts"]
+    standard = rules["standard"]
+    eligible = passed & standard
+    has_eligible = eligible.any(axis=1)
+    eligible_winner = np.where(eligible, rules["preferenceRank"], rules["count"]).argmin(axis=1)
+
+    fallback_index = rules["fallbackIndex"]
+    if rules["hasStandard"]:
+        # lexicographic (-passCount, failCount, totalGap, -priority, index) over standard results
+        pass_key = np.where(standard, passes, -1)
+        mask = pass_key == pass_key.max(axis=1, keepdims=True)
+        fail_key = np.where(mask, rules["totalCounts"] - passes, np.iinfo(np.int64).max)
+        mask &= fail_key == fail_key.min(axis=1, keepdims=True)
+        gap_key = np.where(mask, gaps, np.inf)
+        mask &= gap_key == gap_key.min(axis=1, keepdims=True)
+        priority_key = np.where(mask, rules["priority"], -np.inf)
+        mask &= priority_key == priority_key.max(axis=1, keepdims=True)
+        near = mask.argmax(axis=1)
+        near_passes = passes[np.arange(chains), near]
+        otherwise = near if fallback_index is None else np.full(chains, fallback_index)
+        fallback_winner = np.where(near_passes > 0, near, otherwise)
+    else:
+        fallback_winner = np.full(chains, 0 if fallback_index is None else fallback_index)
+
+    return {
+        "winnerIndex": np.where(has_eligible, eligible_winner, fallback_winner),
+        "passes": passes,
+        "gaps": gaps,
+        "passed": passed,
+        "nonFallbackEligibleCount": eligible.sum(axis=1),
+    }
+
+
+def objective_for_targets_batch(chain_targets, evaluated: dict, rules: dict):
+    rows = np.arange(chain_targets.shape[0])
+    passed = evaluated["passes"][rows, chain_targets]
+    failed = rules["totalCounts"][chain_targets] - passed
+    gaps = evaluated["gaps"][rows, chain_targets]
+    blockers = (evaluated["passed"] & rules["outrankedBy"][chain_targets]).sum(axis=1)
+    score = passed * 1200.0 - failed * 1000.0 - gaps * 85.0 - blockers * 1500.0
+    return np.where(evaluated["winnerIndex"] == chain_targets, 1_000_000_000.0, score)
+
+
+def search_targets_batched(
+    matrix: list[list[list[int]]],
+    targets: list[int],
+    seed: int,
+    dim_count: int,
+    results: list[dict],
+    max_iterations: int | dict[int, int] | None = None,
+    initial_answers: dict[int, list[int]] | None = None,
+    deadline: float | None = None,
+    rules: dict | None = None,
+    max_misses: int | None = None,
+) -> dict[int, dict]:
+    rng = np.random.default_rng(seed)
+    rules = rules or compile_batch_rules(results)
+    weights, option_counts = matrix_to_arrays(matrix, dim_count)
+    q_count = len(matrix)
+    q_index = np.arange(q_count)
+    span = max(1, int(CONFIG["ANSWER_MUTATION_SPAN"]))
+
+    full = int(CONFIG["SEARCH_RESTARTS"]) * int(CONFIG["SEARCH_ITERATIONS"])
+    chains = {}
+    max_steps = {}
+    for ti in targets:
+        budget = max_iterations.get(ti) if isinstance(max_iterations, dict) else max_iterations
+        budget = full if budget is None else min(full, max(0, int(budget)))
+        # fewer chains for smaller budgets, so each chain still anneals for about SEARCH_ITERATIONS steps
+        chains[ti] = min(max(1, int(CONFIG["SEARCH_CHAINS"])), max(1, budget // max(1, int(CONFIG["SEARCH_ITERATIONS"]))))
+        max_steps[ti] = -(-budget // chains[ti])
+
+    live = list(targets)
+    block_sizes = np.array([chains[ti] for ti in live], dtype=np.int64)
+    chain_targets = np.repeat(np.array(live, dtype=np.int64), block_sizes)
+    starts = np.concatenate(([0], np.cumsum(block_sizes)[:-1]))
+    answers = (rng.random((chain_targets.shape[0], q_count)) * option_counts).astype(np.int64)
+    for pos, ti in enumerate(live):
+        if initial_answers and initial_answers.get(ti) is not None:
+            answers[starts[pos]] = initial_answers[ti]
+    raw = weights[q_index, answers].sum(axis=1)
+
+    evaluated = evaluate_results_batch(summarize_scores_batch(raw), rules)
+    current_score = objective_for_targets_batch(chain_targets, evaluated, rules)
+    out: dict[int, dict] = {}
+    best_score = {ti: float("-inf") for ti in targets}
+    best_answers = {ti: answers[starts[pos]].tolist() for pos, ti in enumerate(live)}
+    misses = 0
+
+    def miss(ti: int, steps_done: int, aborted: bool = False) -> dict:
+        res = {
+            "found": False,
+            "bestScore": best_score[ti],
+            "bestAnswers": best_answers[ti],
+            "iterations": steps_done * chains[ti],
+        }
+        return {**res, "aborted": True} if aborted else res
+
+    def settle(scores, candidates, hits, steps_done: int):
+        nonlocal live, chain_targets, starts, answers, raw, current_score, misses
+        keep = np.ones(len(live), dtype=bool)
+        for pos, ti in enumerate(live):
+            block = slice(starts[pos], starts[pos] + chains[ti])
+            block_hits = np.flatnonzero(hits[block])
+            if block_hits.size:
+                ci = starts[pos] + int(block_hits[0])
+                out[ti] = {
+                    "found": True,
+                    "bestScore": float(scores[ci]),
+                    "bestAnswers": candidates[ci].tolist(),
+                    "iterations": steps_done * chains[ti],
+                }
+                keep[pos] = False
+                continue
+            ci = starts[pos] + int(scores[block].argmax())
+            if scores[ci] > best_score[ti]:
+                best_score[ti] = float(scores[ci])
+                best_answers[ti] = candidates[ci].tolist()
+            if steps_done >= max_steps[ti]:
+                out[ti] = miss(ti, steps_done)
+                misses += 1
+                keep[pos] = False
+        if not keep.all():
+            chain_keep = np.repeat(keep, [chains[ti] for ti in live])
+            live = [ti for pos, ti in enumerate(live) if keep[pos]]
+            chain_targets = chain_targets[chain_keep]
+            answers = answers[chain_keep]
+            raw = raw[chain_keep]
+            current_score = current_score[chain_keep]
+            sizes = [chains[ti] for ti in live]
+            starts = np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.int64) if live else starts[:0]
+
+    settle(current_score, answers, evaluated["winnerIndex"] == chain_targets, 0)
+
+    temperature = 1.0
+    steps = 0
+    while live:
+        # once too many targets are out of budget the candidate cannot matter, so the rest are abandoned
+        if max_misses is not None and misses > max_misses:
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        steps += 1
+        n = chain_targets.shape[0]
+        rows = np.arange(n)
+        candidate = answers.copy()
+        candidate_raw = raw.copy()
+        moves = 1 + rng.integers(0, span, size=n)
+        for move in range(span):
+            qi = rng.integers(0, q_count, size=n)
+            counts = option_counts[qi]
+            mask = (moves > move) & (counts > 1)
+            prev = candidate[rows, qi]
+            nxt = (prev + 1 + (rng.random(n) * np.maximum(1, counts - 1)).astype(np.int64)) % np.maximum(1, counts)
+            idx, qm, pm, nm = rows[mask], qi[mask], prev[mask], nxt[mask]
+            candidate_raw[idx] += weights[qm, nm] - weights[qm, pm]
+            candidate[idx, qm] = nm
+
+        evaluated = evaluate_results_batch(summarize_scores_batch(candidate_raw), rules)
+        candidate_score = objective_for_targets_batch(chain_targets, evaluated, rules)
+
+        delta = candidate_score - current_score
+        accept = (delta >= 0) | (
+            rng.random(n) < np.exp(np.clip(delta / max(1.0, temperature * 700.0), -60.0, 60.0))
+        )
+        answers = np.where(accept[:, None], candidate, answers)
+        raw = np.where(accept[:, None], candidate_raw, raw)
+        current_score = np.where(accept, candidate_score, current_score)
+
+        settle(candidate_score, candidate, evaluated["winnerIndex"] == chain_targets, steps)
+        temperature *= 0.9997
+
+    aborted = max_misses is not None and misses > max_misses
+    for ti in live:
+        out[ti] = miss(ti, steps, aborted)
+    return out
+
+
+def search_for_target_batched(
+    matrix: list[list[list[int]]],
+    target_i: int,
+    seed: int,
+    dim_count: int,
+    results: list[dict],
+    max_iterations: int | None = None,
+    initial_answers: list[int] | None = None,
+    deadline: float | None = None,
+    rules: dict | None = None,
+) -> dict:
+    return search_targets_batched(
+        matrix,
+        [target_i],
+        seed,
+        dim_count,
+        results,
+        max_iterations=max_iterations,
+        initial_answers={target_i: initial_answers} if initial_answers is not None else None,
+        deadline=deadline,
+        rules=rules,
+    )[target_i]
+
+
+CONDITION_CODES = {
+    "min": 0,
+    "max_le": 1,
+    "max_ge": 2,
+    "diff_greater": 3,
+    "diff_abs_lte": 4,
+    "top_is": 5,
+    "not_top_is": 6,
+    "rank_is": 7,
+    "top_diff_gte": 8,
+    "top_diff_lte": 9,
+    "total_min": 10,
+    "total_max": 11,
+    "sum_min": 12,
+    "sum_max": 13,
+    "spread_between": 14,
+}
+
+
+def jit_kernel(fn):
+    if numba is None:
+        return fn
+    return numba.njit(cache=False, nogil=True)(fn)
+
+
+def ruleset_kernel_backend(results: list[dict]) -> dict:
+    # the parity verdict is shared per ruleset; KERNEL_BACKEND "python" still opts a single run out
+    if str(CONFIG["KERNEL_BACKEND"]).lower() == "python":
+        return {"name": "python", "reason": "requested"}
+    return compiled_ruleset(results).get("kernels", {"name": "python", "reason": "not initialized"})
+
+
+def kernel_backend_active(results: list[dict]) -> bool:
+    return ruleset_kernel_backend(results)["name"] == "numba"
+
+
+def kernel_backend_report(results: list[dict]) -> dict:
+    return {**ruleset_kernel_backend(results), "search": search_engine(results)}
+
+
+def encode_kernel_tables(results: list[dict]) -> dict:
+    # cond_ints columns: code, dim (or a), b, rank, dims offset, dims length
+    cond_ints = []
+    cond_values = []
+    dims_pool = []
+    result_starts = [0]
+    for res in results:
+        for cond in res["conditions"]:
+            dims = cond.get("dims", [])
+            cond_ints.append(
+                [
+                    CONDITION_CODES.get(cond["type"], -1),
+                    cond.get("dim", cond.get("a", 0)),
+                    cond.get("b", 0),
+                    cond.get("rank", 0),
+                    len(dims_pool),
+                    len(dims),
+                ]
+            )
+            cond_values.append([cond.get("value", 0.0), cond.get("min", 0.0), cond.get("max", 0.0)])
+            dims_pool.extend(dims)
+        result_starts.append(len(cond_ints))
+
+    count = len(results)
+    return {
+        "condInts": np.array(cond_ints, dtype=np.int64).reshape(-1, 6),
+        "condValues": np.array(cond_values, dtype=np.float64).reshape(-1, 3),
+        "dimsPool": np.array(dims_pool, dtype=np.int64),
+        "resultStarts": np.array(result_starts, dtype=np.int64),
+        "priority": np.array([r["priority"] for r in results], dtype=np.int64),
+        "isFallback": np.array([1 if r["isFallback"] else 0 for r in results], dtype=np.int64),
+        "outrankedBy": np.array(
+            [[1 if i != t and not results[i]["isFallback"] and outranks(i, t, results) else 0 for i in range(count)] for t in range(count)],
+            dtype=np.int64,
+        ),
+    }
+
+
+def encode_kernel_matrix(matrix: list[list[list[int]]], dim_count: int) -> tuple:
+    weights, option_counts = matrix_to_arrays(matrix, dim_count)
+    return weights.ravel(), option_counts, weights.shape[1]
+
+
+@jit_kernel
+def kernel_score_answers(weights, option_counts, option_stride, dim_count, answers, scores):
+    for di in range(dim_count):
+        scores[di] = 0
+    for qi in range(answers.shape[0]):
+        oi = answers[qi]
+        if oi < 0 or oi >= option_counts[qi]:
+            continue
+        base = (qi * option_stride + oi) * dim_count
+        for di in range(dim_count):
+            scores[di] += weights[base + di]
+    for di in range(dim_count):
+        if scores[di] < SCORE_MIN:
+            scores[di] = SCORE_MIN
+        elif scores[di] > SCORE_MAX:
+            scores[di] = SCORE_MAX
+
+
+@jit_kernel
+def kernel_summarize_scores(scores, ranks):
+    dim_count = scores.shape[0]
+    total = 0
+    high = scores[0]
+    low = scores[0]
+    top_dim = 0
+    second_dim = 0
+    for i in range(dim_count):
+        total += scores[i]
+        high = max(high, scores[i])
+        low = min(low, scores[i])
+        rank = 1
+        for j in range(dim_count):
+            if scores[j] > scores[i] or (scores[j] == scores[i] and j < i):
+                rank += 1
+        ranks[i] = rank
+        if rank == 1:
+            top_dim = i
+        elif rank == 2:
+            second_dim = i
+    if dim_count < 2:
+        second_dim = top_dim
+    return total, high - low, top_dim, scores[top_dim], scores[second_dim]
+
+
+@jit_kernel
+def kernel_condition_gap(k, cond_ints, cond_values, dims_pool, scores, ranks, total, spread, top_dim, top_score, second_score):
+    code = cond_ints[k, 0]
+    dim = cond_ints[k, 1]
+    value = cond_values[k, 0]
+
+    if code == 0 or code == 2:
+        return max(0.0, value - scores[dim])
+    if code == 1:
+        return max(0.0, scores[dim] - value)
+    if code == 3:
+        diff = scores[dim] - scores[cond_ints[k, 2]]
+        return 0.0 if diff > value else value - diff + 1.0
+    if code == 4:
+        return max(0.0, abs(scores[dim] - scores[cond_ints[k, 2]]) - value)
+    if code == 5:
+        return 0.0 if top_dim == dim else 1.0
+    if code == 6:
+        return 0.0 if top_dim != dim else 1.0
+    if code == 7:
+        return float(abs(ranks[dim] - cond_ints[k, 3]))
+    if code == 8:
+        return max(0.0, value - (top_score - second_score))
+    if code == 9:
+        return max(0.0, (top_score - second_score) - value)
+    if code == 10:
+        return max(0.0, value - total)
+    if code == 11:
+        return max(0.0, total - value)
+    if code == 12 or code == 13:
+        subset = 0
+        for p in range(cond_ints[k, 4], cond_ints[k, 4] + cond_ints[k, 5]):
+            subset += scores[dims_pool[p]]
+        return max(0.0, value - subset) if code == 12 else max(0.0, subset - value)
+    if code == 14:
+        if spread < cond_values[k, 1]:
+            return cond_values[k, 1] - spread
+        if spread > cond_values[k, 2]:
+            return spread - cond_values[k, 2]
+        return 0.0
+    return 1.0
+
+
+@jit_kernel
+def kernel_evaluate_results(cond_ints, cond_values, dims_pool, result_starts, priority, is_fallback, scores, ranks, passes, gaps):
+    total, spread, top_dim, top_score, second_score = kernel_summarize_scores(scores, ranks)
+    count = priority.shape[0]
+    eligible = -1
+    eligible_count = 0
+    near = -1
+    fallback = -1
+    for r in range(count):
+        pass_count = 0
+        total_gap = 0.0
+        for k in range(result_starts[r], result_starts[r + 1]):
+            gap = kernel_condition_gap(k, cond_ints, cond_values, dims_pool, scores, ranks, total, spread, top_dim, top_score, second_score)
+            total_gap += gap
+            if gap == 0:
+                pass_count += 1
+        passes[r] = pass_count
+        gaps[r] = total_gap
+
+        if is_fallback[r]:
+            if fallback < 0:
+                fallback = r
+            continue
+        total_count = result_starts[r + 1] - result_starts[r]
+        if pass_count == total_count:
+            eligible_count += 1
+            if eligible < 0 or priority[r] > priority[eligible]:
+                eligible = r
+        if near < 0:
+            near = r
+            continue
+        near_fail = result_starts[near + 1] - result_starts[near] - passes[near]
+        fail = total_count - pass_count
+        if pass_count != passes[near]:
+            better = pass_count > passes[near]
+        elif fail != near_fail:
+            better = fail < near_fail
+        elif total_gap != gaps[near]:
+            better = total_gap < gaps[near]
+        else:
+            better = priority[r] > priority[near]
+        if better:
+            near = r
+
+    if eligible >= 0:
+        return eligible, eligible_count
+    if near >= 0 and passes[near] > 0:
+        return near, eligible_count
+    if fallback >= 0:
+        return fallback, eligible_count
+    return max(near, 0), eligible_count
+
+
+@jit_kernel
+def kernel_objective(target, winner, result_starts, outranked_by, passes, gaps):
+    if winner == target:
+        return 1_000_000_000.0
+    blockers = 0
+    for i in range(passes.shape[0]):
+        if outranked_by[target, i] and passes[i] == result_starts[i + 1] - result_starts[i]:
+            blockers += 1
+    passed = passes[target]
+    failed = result_starts[target + 1] - result_starts[target] - passed
+    return passed * 1200.0 - failed * 1000.0 - gaps[target] * 85.0 - blockers * 1500.0
+
+
+@jit_kernel
+def kernel_anneal(
+    weights, option_counts, option_stride, dim_count,
+    cond_ints, cond_values, dims_pool, result_starts, priority, is_fallback, outranked_by,
+    target, seed, iterations, span, current, best, best_score,
+):
+    np.random.seed(seed)
+    count = priority.shape[0]
+    scores = np.zeros(dim_count, dtype=np.int64)
+    ranks = np.zeros(dim_count, dtype=np.int64)
+    passes = np.zeros(count, dtype=np.int64)
+    gaps = np.zeros(count, dtype=np.float64)
+    candidate = current.copy()
+    q_count = current.shape[0]
+
+    kernel_score_answers(weights, option_counts, option_stride, dim_count, current, scores)
+    winner, _ = kernel_evaluate_results(cond_ints, cond_values, dims_pool, result_starts, priority, is_fallback, scores, ranks, passes, gaps)
+    current_score = kernel_objective(target, winner, result_starts, outranked_by, passes, gaps)
+    if winner == target:
+        best[:] = current
+        return True, current_score, 0
+    if current_score > best_score:
+        best_score = current_score
+        best[:] = current
+
+    temperature = 1.0
+    for step in range(iterations):
+        candidate[:] = current
+        moves = 1 + np.random.randint(0, max(1, span))
+        for _ in range(moves):
+            qi = np.random.randint(0, q_count)
+            option_count = option_counts[qi]
+            if option_count <= 1:
+                continue
+            prev = candidate[qi]
+            nxt = prev
+            while nxt == prev:
+                nxt = np.random.randint(0, option_count)
+            candidate[qi] = nxt
+
+        kernel_score_answers(weights, option_counts, option_stride, dim_count, candidate, scores)
+        winner, _ = kernel_evaluate_results(cond_ints, cond_values, dims_pool, result_starts, priority, is_fallback, scores, ranks, passes, gaps)
+        cscore = kernel_objective(target, winner, result_starts, outranked_by, passes, gaps)
+        if winner == target:
+            best[:] = candidate
+            return True, cscore, step + 1
+        if cscore > best_score:
+            best_score = cscore
+            best[:] = candidate
+
+        delta = cscore - current_score
+        accept = np.exp(min(60.0, max(-60.0, delta / max(1.0, temperature * 700.0))))
+        if delta >= 0 or np.random.random() < accept:
+            current[:] = candidate
+            current_score = cscore
+        temperature *= 0.9997
+
+    return False, best_score, iterations
+
+
+@jit_kernel
+def kernel_sample_winners(
+    weights, option_counts, option_stride, dim_count,
+    cond_ints, cond_values, dims_pool, result_starts, priority, is_fallback,
+    seed, samples, counts,
+):
+    np.random.seed(seed)
+    q_count = option_counts.shape[0]
+    answers = np.zeros(q_count, dtype=np.int64)
+    scores = np.zeros(dim_count, dtype=np.int64)
+    ranks = np.zeros(dim_count, dtype=np.int64)
+    passes = np.zeros(priority.shape[0], dtype=np.int64)
+    gaps = np.zeros(priority.shape[0], dtype=np.float64)
+    no_eligible = 0
+    for _ in range(samples):
+        for qi in range(q_count):
+            answers[qi] = np.random.randint(0, option_counts[qi]) if option_counts[qi] > 0 else 0
+        kernel_score_answers(weights, option_counts, option_stride, dim_count, answers, scores)
+        winner, eligible_count = kernel_evaluate_results(cond_ints, cond_values, dims_pool, result_starts, priority, is_fallback, scores, ranks, passes, gaps)
+        if 0 <= winner < counts.shape[0]:
+            counts[winner] += 1
+        if eligible_count == 0:
+            no_eligible += 1
+    return no_eligible
+
+
+def kernel_table_args(tables: dict) -> tuple:
+    return (
+        tables["condInts"],
+        tables["condValues"],
+        tables["dimsPool"],
+        tables["resultStarts"],
+        tables["priority"],
+        tables["isFallback"],
+    )
+
+
+def search_for_target_compiled(
+    matrix: list[list[list[int]]],
+    target_i: int,
+    seed: int,
+    dim_count: int,
+    results: list[dict],
+    max_iterations: int | None = None,
+    initial_answers: list[int] | None = None,
+    deadline: float | None = None,
+    tables: dict | None = None,
+) -> dict:
+    tables = tables or encode_kernel_tables(results)
+    weights, option_counts, option_stride = encode_kernel_matrix(matrix, dim_count)
+    rng = random.Random(seed)
+    best_answers = create_random_answers(matrix, rng)
+    if initial_answers is not None:
+        best_answers = list(initial_answers)
+    best = np.array(best_answers, dtype=np.int64)
+    best_score = float("-inf")
+    budget = int(CONFIG["SEARCH_RESTARTS"]) * int(CONFIG["SEARCH_ITERATIONS"])
+    if max_iterations is not None:
+        budget = min(budget, max(0, int(max_iterations)))
+    used = 0
+
+    for restart in range(CONFIG["SEARCH_RESTARTS"]):
+        if restart > 0 and (used >= budget or (deadline is not None and time.monotonic() >= deadline)):
+            break
+        start = best.copy() if restart == 0 else np.array(create_random_answers(matrix, rng), dtype=np.int64)
+        found, best_score, steps = kernel_anneal(
+            weights, option_counts, option_stride, dim_count,
+            *kernel_table_args(tables), tables["outrankedBy"],
+            target_i, rng.randrange(2**31), min(int(CONFIG["SEARCH_ITERATIONS"]), budget - used),
+            int(CONFIG["ANSWER_MUTATION_SPAN"]), start, best, best_score,
+        )
+        used += int(steps)
+        if found:
+            return {"found": True, "bestScore": float(best_score), "bestAnswers": best.tolist(), "iterations": used}
+
+    return {"found": False, "bestScore": float(best_score), "bestAnswers": best.tolist(), "iterations": used}
+
+
+def check_kernel_parity(matrix: list[list[list[int]]], dim_count: int, results: list[dict], samples: int, seed: int) -> int:
+    tables = encode_kernel_tables(results)
+    weights, option_counts, option_stride = encode_kernel_matrix(matrix, dim_count)
+    scores = np.zeros(dim_count, dtype=np.int64)
+    ranks = np.zeros(dim_count, dtype=np.int64)
+    passes = np.zeros(len(results), dtype=np.int64)
+    gaps = np.zeros(len(results), dtype=np.float64)
+    rng = random.Random(seed)
+    mismatches = 0
+
+    for _ in range(samples):
+        answers = create_random_answers(matrix, rng)
+        ref_scores = score_answers(dim_count, matrix, answers)
+        ref_summary = summarize_scores(ref_scores)
+        ref_eval = evaluate_results(ref_summary, results)
+
+        kernel_score_answers(weights, option_counts, option_stride, dim_count, np.array(answers, dtype=np.int64), scores)
+        winner, eligible_count = kernel_evaluate_results(*kernel_table_args(tables), scores, ranks, passes, gaps)
+
+        same = (
+            scores.tolist() == ref_scores
+            and ranks.tolist() == ref_summary["ranks"]
+            and winner == ref_eval["winnerIndex"]
+            and eligible_count == ref_eval["nonFallbackEligibleCount"]
+            and passes.tolist() == [c["passCount"] for c in ref_eval["checks"]]
+            and gaps.tolist() == [c["totalGap"] for c in ref_eval["checks"]]
+        )
+        for ti in range(len(results)):
+            if not same:
+                break
+            ref_objective = objective_for_target(ti, ref_eval["winnerIndex"], ref_eval["checks"], results)
+            same = kernel_objective(ti, winner, tables["resultStarts"], tables["outrankedBy"], passes, gaps) == ref_objective
+        if not same:
+            mismatches += 1
+    return mismatches
+
+
+def check_anneal_parity(matrix: list[list[list[int]]], dim_count: int, results: list[dict], iterations: int, seed: int) -> int:
+    # fixed-seed anneal per target: witnesses must win under evaluate_results, and the
+    # reported best score must be the reference objective of the reported best answers
+    tables = encode_kernel_tables(results)
+    weights, option_counts, option_stride = encode_kernel_matrix(matrix, dim_count)
+    rng = random.Random(seed)
+    mismatches = 0
+    for ti in [i for i, r in enumerate(results) if not r["isFallback"]]:
+        start = np.array(create_random_answers(matrix, rng), dtype=np.int64)
+        best = start.copy()
+        found, best_score, steps = kernel_anneal(
+            weights, option_counts, option_stride, dim_count,
+            *kernel_table_args(tables), tables["outrankedBy"],
+            ti, seed + ti, iterations, int(CONFIG["ANSWER_MUTATION_SPAN"]), start, best, float("-inf"),
+        )
+        ref_eval = evaluate_results(summarize_scores(score_answers(dim_count, matrix, best.tolist())), results)
+        ref_score = objective_for_target(ti, ref_eval["winnerIndex"], ref_eval["checks"], results)
+        if bool(found) != (ref_eval["winnerIndex"] == ti) or best_score != ref_score or not 0 <= steps <= iterations:
+            mismatches += 1
+    return mismatches
+
+
+def check_sampling_parity(matrix: list[list[list[int]]], dim_count: int, results: list[dict], samples: int, seed: int) -> int:
+    # kernel and reference samplers use different generators, so compare rates within binomial noise
+    tables = encode_kernel_tables(results)
+    weights, option_counts, option_stride = encode_kernel_matrix(matrix, dim_count)
+    counts = np.zeros(len(results), dtype=np.int64)
+    no_eligible = kernel_sample_winners(
+        weights, option_counts, option_stride, dim_count,
+        *kernel_table_args(tables), seed, samples, counts,
+    )
+    rng = random.Random(seed)
+    ref_counts = [0] * len(results)
+    ref_no_eligible = 0
+    for _ in range(samples):
+        ev = evaluate_results(summarize_scores(score_answers(dim_count, matrix, create_random_answers(matrix, rng))), results)
+        ref_counts[ev["winnerIndex"]] += 1
+        ref_no_eligible += int(ev["nonFallbackEligibleCount"] == 0)
+
+    mismatches = 0
+    for a, b in zip(counts.tolist() + [int(no_eligible)], ref_counts + [ref_no_eligible]):
+        pa, pb = a / float(samples), b / float(samples)
+        p = (pa + pb) / 2.0
+        if abs(pa - pb) > 5.0 * math.sqrt(2.0 * p * (1.0 - p) / samples) + 1.0 / samples:
+            mismatches += 1
+    return mismatches
+
+
+def init_kernel_backend(matrix: list[list[list[int]]], dim_count: int, results: list[dict]) -> dict:
+    entry = compiled_ruleset(results)
+    if str(CONFIG["KERNEL_BACKEND"]).lower() == "python" or "kernels" in entry:
+        return kernel_backend_report(results)
+    if numba is None or np is None:
+        entry["kernels"] = {"name": "python", "reason": "numba not available"}
+        return kernel_backend_report(results)
+
+    samples = int(CONFIG["KERNEL_PARITY_SAMPLES"])
+    seed = int(CONFIG["SEED"])
+    # every kernel is compiled and exercised here, so a compile or typing failure falls back to Python
+    try:
+        failures = {
+            "evaluation": check_kernel_parity(matrix, dim_count, results, samples, seed),
+            "anneal": check_anneal_parity(matrix, dim_count, results, min(samples, int(CONFIG["SEARCH_ITERATIONS"])), seed),
+            "sampling": check_sampling_parity(matrix, dim_count, results, samples, seed),
+        }
+    except Exception as exc:
+        entry["kernels"] = {"name": "python", "reason": f"compile failed: {exc}"}
+    else:
+        failed = [f"{name} {count}" for name, count in failures.items() if count]
+        if failed:
+            entry["kernels"] = {"name": "python", "reason": "parity failed: " + ", ".join(failed)}
+        else:
+            entry["kernels"] = {"name": "numba", "reason": f"parity ok on {samples} samples"}
+    return kernel_backend_report(results)
 
-def evaluate_reachability(matrix: list[list[list[int]]], results: list[dict], targets: list[int], dim_count: int, seed_base: int) -> dict:
-    found_ids = []
-    missing_ids = []
-    utility = 0.0
-    per_class = []
 
+def create_search_scheduler(targets: list[int]) -> dict | None:
+    if int(CONFIG["SEARCH_BUDGET_ITERATIONS"]) <= 0 and float(CONFIG["SEARCH_BUDGET_SECONDS"]) <= 0:
+        return None
+
+    full = int(CONFIG["SEARCH_RESTARTS"]) * int(CONFIG["SEARCH_ITERATIONS"])
+    return {
+        "fullIterations": full,
+        "difficulty": {ti: float(full) for ti in targets},
+        "witness": {},
+        "searches": {ti: 0 for ti in targets},
+        "found": {ti: 0 for ti in targets},
+        "reused": {ti: 0 for ti in targets},
+        "skipped": {ti: 0 for ti in targets},
+        "allocated": {ti: 0 for ti in targets},
+        "spent": {ti: 0 for ti in targets},
+        "spentSeconds": {ti: 0.0 for ti in targets},
+    }
+
+
+def reuse_witnesses(
+    scheduler: dict,
+    matrix: list[list[list[int]]],
+    targets: list[int],
+    dim_count: int,
+    results: list[dict],
+    edits: list[tuple],
+) -> dict[int, dict]:
+    # a witness keeps its scores unless an edit hits an option on its answer path; it may come
+    # from a rejected candidate though, so it is still confirmed on this matrix
+    touched = {(qi, oi) for qi, oi, _, old, new in edits if old != new}
+    reused = {}
     for ti in targets:
-        res = search_for_target(matrix, ti, seed_base + ti * 7919, dim_count, results)
+        witness = scheduler["witness"].get(ti)
+        if witness is None or any((qi, oi) in touched for qi, oi in enumerate(witness)):
+            continue
+        evaluated = evaluate_results(summarize_scores(score_answers(dim_count, matrix, witness)), results)
+        if evaluated["winnerIndex"] == ti:
+            score = objective_for_target(ti, ti, evaluated["checks"], results)
+            reused[ti] = {"found": True, "bestScore": score, "bestAnswers": list(witness), "iterations": 0}
+    return reused
+
+
+def update_search_scheduler(scheduler: dict, ti: int, res: dict, allocated: int, seconds: float, skipped: bool) -> None:
+    scheduler["searches"][ti] += 1
+    scheduler["allocated"][ti] += allocated
+    scheduler["spent"][ti] += res["iterations"]
+    scheduler["spentSeconds"][ti] += seconds
+    if skipped:
+        scheduler["skipped"][ti] += 1
+        return
+
+    if res["found"]:
+        scheduler["found"][ti] += 1
+        scheduler["witness"][ti] = list(res["bestAnswers"])
+        cost = float(res["iterations"])
+    else:
+        # a miss says nothing about how much more search the target needs, so assume the full budget
+        cost = float(scheduler["fullIterations"])
+
+    # the first observation replaces the full-budget prior instead of being averaged into it
+    observed = scheduler["searches"][ti] - scheduler["skipped"][ti]
+    decay = clamp(float(CONFIG["SEARCH_DIFFICULTY_DECAY"]), 0.0, 1.0) if observed > 1 else 0.0
+    scheduler["difficulty"][ti] = decay * scheduler["difficulty"][ti] + (1.0 - decay) * cost
+
+
+def summarize_search_scheduler(scheduler: dict | None, results: list[dict]) -> dict | None:
+    if scheduler is None:
+        return None
+
+    per_class = {}
+    for ti in scheduler["difficulty"]:
+        per_class[results[ti]["id"]] = {
+            "searches": scheduler["searches"][ti],
+            "found": scheduler["found"][ti],
+            "reused": scheduler["reused"][ti],
+            "skipped": scheduler["skipped"][ti],
+            "allocatedIterations": scheduler["allocated"][ti],
+            "spentIterations": scheduler["spent"][ti],
+            "spentSeconds": scheduler["spentSeconds"][ti],
+            "difficulty": scheduler["difficulty"][ti],
+        }
+
+    return {
+        "budgetIterations": int(CONFIG["SEARCH_BUDGET_ITERATIONS"]),
+        "budgetSeconds": float(CONFIG["SEARCH_BUDGET_SECONDS"]),
+        "spentIterations": sum(scheduler["spent"].values()),
+        "spentSeconds": sum(scheduler["spentSeconds"].values()),
+        "skippedSearches": sum(scheduler["skipped"].values()),
+        "reusedWitnesses": sum(scheduler["reused"].values()),
+        "classes": per_class,
+    }
+
+
+def evaluate_reachability(
+    matrix: list[list[list[int]]],
+    results: list[dict],
+    targets: list[int],
+    dim_count: int,
+    seed_base: int,
+    scheduler: dict | None = None,
+    edits: list[tuple] | None = None,
+    min_found: int | None = None,
+) -> dict:
+    by_target = {}
+
+    engine = search_engine(results)
+    batched = engine == "batched"
+    if engine == "compiled":
+        search, search_kwargs = search_for_target_compiled, {"tables": ruleset_kernel_tables(results)}
+    elif batched:
+        search, search_kwargs = search_for_target_batched, {"rules": ruleset_batch_rules(results)}
+    else:
+        search, search_kwargs = search_for_target, {}
+
+    if scheduler is None and batched:
+        by_target = search_targets_batched(matrix, targets, seed_base, dim_count, results, **search_kwargs)
+    elif scheduler is None:
+        for ti in targets:
+            by_target[ti] = search(matrix, ti, seed_base + ti * 7919, dim_count, results, **search_kwargs)
+    else:
+        # the seeding evaluation is the baseline every candidate is compared against, so it gets the
+        # full fixed budget; afterwards targets whose witness still wins skip the search entirely
+        seeding = edits is None
+        reused = {} if seeding else reuse_witnesses(scheduler, matrix, targets, dim_count, results, edits)
+        for ti, res in reused.items():
+            scheduler["reused"][ti] += 1
+            by_target[ti] = {**res, "allocatedIterations": 0, "skipped": False}
+
+        # Hardest targets first: a miss there is what decides whether the rest still matter.
+        weights = {ti: max(1.0, scheduler["difficulty"][ti]) for ti in targets if ti not in reused}
+        order = sorted(weights, key=lambda ti: (-weights[ti], ti))
+        budget_iterations = int(CONFIG["SEARCH_BUDGET_ITERATIONS"])
+        budget_seconds = float(CONFIG["SEARCH_BUDGET_SECONDS"])
+        min_iterations = int(CONFIG["SEARCH_BUDGET_MIN_ITERATIONS"])
+        full_iterations = scheduler["fullIterations"]
+        remaining_iterations = budget_iterations
+        start = time.monotonic()
+        found_so_far = len(reused)
+
+        if batched:
+            # the batched engine runs every scheduled target in one lockstep call, each with its own
+            # budget, so per-step overhead is shared and small budgets still get deep chains
+            total_weight = sum(weights.values())
+            allocations = {}
+            for ti in order:
+                if seeding:
+                    allocations[ti] = full_iterations
+                elif budget_iterations > 0:
+                    allocations[ti] = min(full_iterations, max(min_iterations, int(budget_iterations * weights[ti] / total_weight)))
+                else:
+                    allocations[ti] = None
+            deadline = start + budget_seconds if budget_seconds > 0 and not seeding else None
+            lockstep = search_targets_batched(
+                matrix,
+                order,
+                seed_base,
+                dim_count,
+                results,
+                max_iterations=allocations,
+                initial_answers=scheduler["witness"],
+                deadline=deadline,
+                max_misses=None if min_found is None else found_so_far + len(order) - min_found,
+                **search_kwargs,
+            )
+            seconds = (time.monotonic() - start) / max(1, len(order))
+            for ti in order:
+                res = lockstep[ti]
+                skipped = res.pop("aborted", False)
+                allocated = res["iterations"] if allocations[ti] is None else allocations[ti]
+                update_search_scheduler(scheduler, ti, res, allocated, seconds, skipped)
+                by_target[ti] = {**res, "allocatedIterations": allocated, "skipped": skipped}
+        else:
+            for pos, ti in enumerate(order):
+                remaining_weight = sum(weights[x] for x in order[pos:])
+                share = weights[ti] / remaining_weight
+                skipped = min_found is not None and found_so_far + len(order) - pos < min_found
+
+                if skipped:
+                    allocated = 0
+                elif seeding:
+                    allocated = full_iterations
+                elif budget_iterations > 0:
+                    allocated = min(full_iterations, max(min_iterations, int(remaining_iterations * share)))
+                else:
+                    allocated = None
+
+                deadline = None
+                if budget_seconds > 0 and not skipped and not seeding:
+                    now = time.monotonic()
+                    deadline = now + max(0.0, start + budget_seconds - now) * share
+
+                t0 = time.monotonic()
+                res = search(
+                    matrix,
+                    ti,
+                    seed_base + ti * 7919,
+                    dim_count,
+                    results,
+                    max_iterations=allocated,
+                    initial_answers=scheduler["witness"].get(ti),
+                    deadline=deadline,
+                    **search_kwargs,
+                )
+                if allocated is None:
+                    allocated = res["iterations"]
+                update_search_scheduler(scheduler, ti, res, allocated, time.monotonic() - t0, skipped)
+                remaining_iterations = max(0, remaining_iterations - res["iterations"])
+                if res["found"]:
+                    found_so_far += 1
+                by_target[ti] = {**res, "allocatedIterations": allocated, "skipped": skipped}
+
+    per_class = []
+    for ti in targets:
+        res = dict(by_target[ti])
+        res["answerPath"] = encode_answers(res.pop("bestAnswers"))
         per_class.append({"targetIndex": ti, **res})
-        class_id = results[ti]["id"]
+    return summarize_reachability(per_class, results)
+
+
+def summarize_reachability(per_class: list[dict], results: list[dict]) -> dict:
+    found_ids = []
+    missing_ids = []
+    utility = 0.0
+    for res in per_class:
+        class_id = results[res["targetIndex"]]["id"]
         if res["found"]:
             found_ids.append(class_id)
             utility += REACH_SCALE
@@ -448,7 +1651,7 @@ def evaluate_reachability(matrix: list[list[list[int]]], results: list[dict], ta
             utility += res["bestScore"]
 
     found_count = len(found_ids)
-    total_count = len(targets)
+    total_count = len(per_class)
     return {
         "foundCount": found_count,
         "totalCount": total_count,
@@ -456,6 +1659,7 @@ def evaluate_reachability(matrix: list[list[list[int]]], results: list[dict], ta
         "utility": utility,
         "foundIds": found_ids,
         "missingIds": missing_ids,
+        "searchIterations": sum(r["iterations"] for r in per_class),
         "classResults": per_class,
     }
 
@@ -496,23 +1700,71 @@ def estimate_probabilities(
     fallback: list[int],
     target_probs: list[float],
     seed: int,
+    sample_count: int | None = None,
 ) -> dict:
     rng = random.Random(seed)
-    sample_count = int(CONFIG["PROBABILITY_SAMPLES"])
+    sample_count = int(CONFIG["PROBABILITY_SAMPLES"]) if sample_count is None else sample_count
     counts = [0] * len(results)
     no_eligible = 0
 
-    for _ in range(sample_count):
-        answers = create_random_answers(matrix, rng)
-        summary = summarize_scores(score_answers(dim_count, matrix, answers))
-        ev = evaluate_results(summary, results)
-        wi = ev["winnerIndex"]
-        if 0 <= wi < len(counts):
-            counts[wi] += 1
-        if ev["nonFallbackEligibleCount"] == 0:
-            no_eligible += 1
-
+    if kernel_backend_active(results):
+        weights, option_counts, option_stride = encode_kernel_matrix(matrix, dim_count)
+        kernel_counts = np.zeros(len(results), dtype=np.int64)
+        no_eligible = int(
+            kernel_sample_winners(
+                weights, option_counts, option_stride, dim_count,
+                *kernel_table_args(ruleset_kernel_tables(results)),
+                seed & 0x7FFFFFFF, sample_count, kernel_counts,
+            )
+        )
+        counts = kernel_counts.tolist()
+    else:
+        score = answer_scorer(matrix, dim_count)
+        for _ in range(sample_count):
+            answers = create_random_answers(matrix, rng)
+            summary = summarize_scores(score(answers))
+            ev = evaluate_results(summary, results)
+            wi = ev["winnerIndex"]
+            if 0 <= wi < len(counts):
+                counts[wi] += 1
+            if ev["nonFallbackEligibleCount"] == 0:
+                no_eligible += 1
+
+    return probability_estimate_from_counts(counts, no_eligible, sample_count, non_fallback, fallback, target_probs)
+
+
+def probability_estimate_from_counts(
+    counts: list[int],
+    no_eligible: int,
+    sample_count: int,
+    non_fallback: list[int],
+    fallback: list[int],
+    target_probs: list[float],
+) -> dict:
     probs = [c / float(sample_count) for c in counts]
+    no_eligible_rate = no_eligible / float(sample_count)
+    outside_target = sample_count - sum(counts[i] for i in non_fallback)
+
+    return {
+        "sampleCount": sample_count,
+        "counts": counts,
+        "probabilities": probs,
+        "targetProbabilities": target_probs,
+        "noEligibleCount": no_eligible,
+        "noEligibleRate": no_eligible_rate,
+        "outsideTargetCount": outside_target,
+        "outsideTargetRate": outside_target / float(sample_count),
+        **probability_metrics(probs, no_eligible_rate, non_fallback, fallback, target_probs),
+    }
+
+
+def probability_metrics(
+    probs: list[float],
+    no_eligible_rate: float,
+    non_fallback: list[int],
+    fallback: list[int],
+    target_probs: list[float],
+) -> dict:
     nf_probs = [probs[i] for i in non_fallback]
     nf_targets = [target_probs[i] for i in non_fallback]
 
@@ -528,7 +1780,6 @@ def estimate_probabilities(
 
     fallback_excess = max(0.0, fallback_rate - fallback_target)
     fallback_order_violation = max(0.0, fallback_rate - min_non_fallback)
-    no_eligible_rate = no_eligible / float(sample_count)
     no_eligible_penalty = no_eligible_rate * float(CONFIG["NO_ELIGIBLE_WEIGHT"])
 
     penalty = float(CONFIG["PROBABILITY_WEIGHT"]) * (
@@ -540,18 +1791,8 @@ def estimate_probabilities(
         + no_eligible_penalty
     )
 
-    outside_target = sample_count - sum(counts[i] for i in non_fallback)
-
     return {
-        "sampleCount": sample_count,
-        "counts": counts,
-        "probabilities": probs,
-        "targetProbabilities": target_probs,
-        "noEligibleCount": no_eligible,
-        "noEligibleRate": no_eligible_rate,
         "noEligiblePenalty": no_eligible_penalty,
-        "outsideTargetCount": outside_target,
-        "outsideTargetRate": outside_target / float(sample_count),
         "mae": mae,
         "rmse": rmse,
         "maxAbs": max_abs,
@@ -563,15 +1804,183 @@ def estimate_probabilities(
     }
 
 
-def evaluate_candidate(matrix: list[list[list[int]]], dim_count: int, results: list[dict], non_fallback: list[int], fallback: list[int], target_probs: list[float], seed: int) -> dict:
-    reach = evaluate_reachability(matrix, results, non_fallback, dim_count, seed)
+def evaluate_candidate(
+    matrix: list[list[list[int]]],
+    dim_count: int,
+    results: list[dict],
+    non_fallback: list[int],
+    fallback: list[int],
+    target_probs: list[float],
+    seed: int,
+    scheduler: dict | None = None,
+    edits: list[tuple] | None = None,
+    min_found: int | None = None,
+) -> dict:
+    reach = evaluate_reachability(matrix, results, non_fallback, dim_count, seed, scheduler, edits, min_found)
 
     prob = None
     if CONFIG["OPTIMIZE_PROBABILITY"]:
         prob = estimate_probabilities(matrix, dim_count, results, non_fallback, fallback, target_probs, seed ^ 0x9E3779B9)
 
-    score = reach["foundCount"] * 1_000_000_000_000.0 - ((prob["penalty"] if prob else 0.0) * 1_000_000_000.0) + reach["utility"]
-    return {"reachability": reach, "probability": prob, "score": score}
+    return {"reachability": reach, "probability": prob, "score": candidate_score(reach, prob)}
+
+
+def candidate_score(reach: dict, prob: dict | None) -> float:
+    return reach["foundCount"] * 1_000_000_000_000.0 - ((prob["penalty"] if prob else 0.0) * 1_000_000_000.0) + reach["utility"]
+
+
+def create_transposition_table(matrix: list[list[list[int]]]) -> dict | None:
+    capacity = int(CONFIG["TRANSPOSITION_TABLE_SIZE"])
+    if capacity <= 0:
+        return None
+    table = {
+        "capacity": capacity,
+        "keys": {},
+        "keyRng": random.Random(int(CONFIG["SEED"]) ^ 0x5A0B1157),
+        "entries": {},
+        "lookups": 0,
+        "hits": 0,
+        "pooled": 0,
+        "researched": 0,
+        "evictions": 0,
+    }
+    table["rootHash"] = matrix_hash(table, matrix)
+    return table
+
+
+def zobrist_key(table: dict, qi: int, oi: int, di: int, value: int) -> int:
+    cell = (qi, oi, di, value)
+    key = table["keys"].get(cell)
+    if key is None:
+        key = table["keyRng"].getrandbits(64)
+        table["keys"][cell] = key
+    return key
+
+
+def matrix_hash(table: dict, matrix: list[list[list[int]]]) -> int:
+    h = 0
+    for qi, q in enumerate(matrix):
+        for oi, vec in enumerate(q):
+            for di, value in enumerate(vec):
+                h ^= zobrist_key(table, qi, oi, di, value)
+    return h
+
+
+def update_matrix_hash(table: dict, h: int, edits: list[tuple]) -> int:
+    for qi, oi, di, old, new in edits:
+        if old != new:
+            h ^= zobrist_key(table, qi, oi, di, old) ^ zobrist_key(table, qi, oi, di, new)
+    return h
+
+
+def probe_transposition(table: dict, h: int) -> dict | None:
+    table["lookups"] += 1
+    entry = table["entries"].pop(h, None)
+    if entry is None:
+        return None
+    table["entries"][h] = entry
+    table["hits"] += 1
+    return entry
+
+
+def is_partial_evaluation(evaluation: dict) -> bool:
+    # targets skipped by the search scheduler carry no reachability evidence
+    return any(c.get("skipped") for c in evaluation["reachability"]["classResults"])
+
+
+def store_transposition(table: dict, h: int, evaluation: dict) -> None:
+    if is_partial_evaluation(evaluation):
+        return
+    table["entries"].pop(h, None)
+    table["entries"][h] = evaluation
+    while len(table["entries"]) > table["capacity"]:
+        table["entries"].pop(next(iter(table["entries"])))
+        table["evictions"] += 1
+
+
+def merge_reachability(cached: dict, fresh: dict, results: list[dict]) -> dict:
+    fresh_by_target = {c["targetIndex"]: c for c in fresh["classResults"]}
+    per_class = []
+    for res in cached["classResults"]:
+        again = fresh_by_target.get(res["targetIndex"])
+        if again is not None:
+            better = again if again["found"] or again["bestScore"] > res["bestScore"] else res
+            res = {**better, "iterations": res["iterations"] + again["iterations"]}
+        per_class.append(res)
+    return summarize_reachability(per_class, results)
+
+
+def revisit_transposition_entry(
+    table: dict,
+    cached: dict,
+    matrix: list[list[list[int]]],
+    dim_count: int,
+    results: list[dict],
+    non_fallback: list[int],
+    fallback: list[int],
+    target_probs: list[float],
+    seed: int,
+    scheduler: dict | None = None,
+    edits: list[tuple] | None = None,
+) -> dict:
+    # a revisit is new evidence: classes the entry missed are searched again with this attempt's seed,
+    # and the sampled distribution is topped up, keeping whatever either pass established
+    reach = cached["reachability"]
+    if reach["missingIds"]:
+        missing = [c["targetIndex"] for c in reach["classResults"] if not c["found"]]
+        fresh = evaluate_reachability(matrix, results, missing, dim_count, seed, scheduler, edits)
+        reach = merge_reachability(reach, fresh, results)
+        table["researched"] += 1
+
+    prob = cached["probability"]
+    if prob is not None and prob["sampleCount"] < int(CONFIG["TRANSPOSITION_POOL_SAMPLES"]):
+        prob = pool_probability_evidence(
+            table, prob, matrix, dim_count, results, non_fallback, fallback, target_probs, seed ^ 0x9E3779B9
+        )
+
+    if reach is cached["reachability"] and prob is cached["probability"]:
+        return cached
+    return {"reachability": reach, "probability": prob, "score": candidate_score(reach, prob)}
+
+
+def pool_probability_evidence(
+    table: dict,
+    prob: dict,
+    matrix: list[list[list[int]]],
+    dim_count: int,
+    results: list[dict],
+    non_fallback: list[int],
+    fallback: list[int],
+    target_probs: list[float],
+    seed: int,
+) -> dict:
+    top_up = min(int(CONFIG["PROBABILITY_SAMPLES"]), int(CONFIG["TRANSPOSITION_POOL_SAMPLES"]) - prob["sampleCount"])
+    fresh = estimate_probabilities(matrix, dim_count, results, non_fallback, fallback, target_probs, seed, top_up)
+    pooled = probability_estimate_from_counts(
+        [a + b for a, b in zip(prob["counts"], fresh["counts"])],
+        prob["noEligibleCount"] + fresh["noEligibleCount"],
+        prob["sampleCount"] + fresh["sampleCount"],
+        non_fallback,
+        fallback,
+        target_probs,
+    )
+    table["pooled"] += 1
+    return pooled
+
+
+def summarize_transposition_table(table: dict | None) -> dict | None:
+    if table is None:
+        return None
+    return {
+        "capacity": table["capacity"],
+        "size": len(table["entries"]),
+        "lookups": table["lookups"],
+        "hits": table["hits"],
+        "hitRate": table["hits"] / table["lookups"] if table["lookups"] else 0.0,
+        "pooled": table["pooled"],
+        "researched": table["researched"],
+        "evictions": table["evictions"],
+    }
 
 
 def compare_reachability(a: dict, b: dict) -> float:
@@ -610,9 +2019,10 @@ def goal_met(candidate: dict) -> bool:
     return True
 
 
-def mutate_weights(matrix: list[list[list[int]]], dim_count: int, rng: random.Random) -> None:
+def mutate_weights(matrix: list[list[list[int]]], dim_count: int, rng: random.Random) -> list[tuple[int, int, int, int, int]]:
+    edits: list[tuple[int, int, int, int, int]] = []
     if not matrix:
-        return
+        return edits
     total = 1 + rng.randrange(max(1, int(CONFIG["WEIGHT_MUTATION_COUNT"])))
     step = int(CONFIG["WEIGHT_MUTATION_STEP"])
     limit = int(CONFIG["WEIGHT_LIMIT"])
@@ -630,12 +2040,173 @@ def mutate_weights(matrix: list[list[list[int]]], dim_count: int, rng: random.Ra
 
         current = matrix[qi][oi][di]
         matrix[qi][oi][di] = int(clamp(round(current + delta), -limit, limit))
+        edits.append((qi, oi, di, current, matrix[qi][oi][di]))
+    return edits
+
+
+def create_surrogate(results: list[dict], non_fallback: list[int]) -> dict | None:
+    if not CONFIG["SURROGATE_ENABLED"]:
+        return None
+    return {
+        "targets": list(non_fallback),
+        "resultCount": len(results),
+        "gradients": {},
+        "observations": 0,
+        "proposals": 0,
+        "screened": 0,
+        "explored": 0,
+        "absError": 0.0,
+        "errorCount": 0,
+        "screenedHits": 0,
+        "baselineEvaluations": 0,
+        "baselineHits": 0,
+        "partialUpdates": 0,
+    }
+
+
+def surrogate_features(evaluation: dict, surrogate: dict) -> list[float]:
+    contrib = {
+        c["targetIndex"]: (REACH_SCALE if c["found"] else c["bestScore"]) / REACH_SCALE
+        for c in evaluation["reachability"]["classResults"]
+    }
+    features = [contrib[ti] for ti in surrogate["targets"]]
+    prob = evaluation.get("probability")
+    if prob is not None:
+        features += prob["probabilities"] + [prob["noEligibleRate"]]
+    return features
+
+
+def net_edit_deltas(edits: list[tuple]) -> dict[tuple[int, int, int], int]:
+    deltas: dict[tuple[int, int, int], int] = {}
+    for qi, oi, di, old, new in edits:
+        deltas[(qi, oi, di)] = deltas.get((qi, oi, di), 0) + (new - old)
+    return {key: d for key, d in deltas.items() if d != 0}
+
+
+def predict_surrogate(surrogate: dict, base: list[float], deltas: dict[tuple[int, int, int], int]) -> list[float]:
+    predicted = list(base)
+    for key, d in deltas.items():
+        grad = surrogate["gradients"].get(key)
+        if grad is None:
+            continue
+        for k in range(len(predicted)):
+            predicted[k] += d * grad[k]
+    return predicted
+
+
+def surrogate_score(
+    surrogate: dict,
+    features: list[float],
+    non_fallback: list[int],
+    fallback: list[int],
+    target_probs: list[float],
+) -> float:
+    count = len(surrogate["targets"])
+    contrib = features[:count]
+    found = sum(1 for c in contrib if c >= 0.5)
+    score = found * 1_000_000_000_000.0 + sum(contrib) * REACH_SCALE
+    if len(features) > count:
+        probs = features[count:count + surrogate["resultCount"]]
+        metrics = probability_metrics(probs, features[-1], non_fallback, fallback, target_probs)
+        score -= metrics["penalty"] * 1_000_000_000.0
+    return score
+
+
+def screen_weight_mutations(
+    surrogate: dict,
+    matrix: list[list[list[int]]],
+    current_eval: dict,
+    dim_count: int,
+    rng: random.Random,
+    non_fallback: list[int],
+    fallback: list[int],
+    target_probs: list[float],
+) -> tuple[list[tuple], list[float] | None]:
+    if surrogate["observations"] < int(CONFIG["SURROGATE_WARMUP"]):
+        return mutate_weights(matrix, dim_count, rng), None
+
+    if rng.random() < float(CONFIG["SURROGATE_EXPLORE_RATE"]):
+        surrogate["explored"] += 1
+        return mutate_weights(matrix, dim_count, rng), None
+
+    base = surrogate_features(current_eval, surrogate)
+    best = None
+    for _ in range(max(1, int(CONFIG["SURROGATE_PROPOSALS"]))):
+        edits = mutate_weights(matrix, dim_count, rng)
+        undo_weight_edits(matrix, edits)
+        predicted = predict_surrogate(surrogate, base, net_edit_deltas(edits))
+        score = surrogate_score(surrogate, predicted, non_fallback, fallback, target_probs)
+        surrogate["proposals"] += 1
+        if best is None or score > best[0]:
+            best = (score, edits, predicted)
+
+    redo_weight_edits(matrix, best[1])
+    surrogate["screened"] += 1
+    return best[1], best[2]
+
+
+def update_surrogate(
+    surrogate: dict,
+    parent_eval: dict,
+    candidate_eval: dict,
+    edits: list[tuple],
+    predicted: list[float] | None,
+    improved: bool,
+) -> None:
+    # skipped targets report zero contribution, which would read as a real response to the edit
+    if is_partial_evaluation(parent_eval) or is_partial_evaluation(candidate_eval):
+        surrogate["partialUpdates"] += 1
+        return
+
+    base = surrogate_features(parent_eval, surrogate)
+    observed = surrogate_features(candidate_eval, surrogate)
+    deltas = net_edit_deltas(edits)
+
+    if predicted is not None:
+        surrogate["absError"] += sum(abs(a - b) for a, b in zip(predicted, observed)) / float(len(observed) or 1)
+        surrogate["errorCount"] += 1
+        surrogate["screenedHits"] += int(improved)
+    else:
+        surrogate["baselineEvaluations"] += 1
+        surrogate["baselineHits"] += int(improved)
+
+    if not deltas:
+        return
+
+    # normalized LMS step on the local linear response of each (question, option, dim) edit
+    fitted = predict_surrogate(surrogate, base, deltas)
+    norm = float(sum(d * d for d in deltas.values()))
+    rate = float(CONFIG["SURROGATE_LEARNING_RATE"])
+    for key, d in deltas.items():
+        grad = surrogate["gradients"].setdefault(key, [0.0] * len(observed))
+        for k in range(len(observed)):
+            grad[k] += rate * (observed[k] - fitted[k]) * d / norm
+    surrogate["observations"] += 1
+
+
+def summarize_surrogate(surrogate: dict | None) -> dict | None:
+    if surrogate is None:
+        return None
+    screened_evals = surrogate["errorCount"]
+    baseline_evals = surrogate["baselineEvaluations"]
+    return {
+        "observations": surrogate["observations"],
+        "fittedEdits": len(surrogate["gradients"]),
+        "proposalsScored": surrogate["proposals"],
+        "screenedEvaluations": screened_evals,
+        "exploredEvaluations": surrogate["explored"],
+        "proposalsDiscarded": surrogate["proposals"] - surrogate["screened"],
+        "partialUpdatesSkipped": surrogate["partialUpdates"],
+        "meanAbsError": surrogate["absError"] / screened_evals if screened_evals else None,
+        "hitRate": surrogate["screenedHits"] / screened_evals if screened_evals else None,
+        "baselineHitRate": surrogate["baselineHits"] / baseline_evals if baseline_evals else None,
+    }
 
 
 def pct(v: float) -> str:
     return f"{v * 100.0:.2f}%"
 
-def tune(
+def start_tuning(
     dimensions: list[str],
     questions_file: dict,
     matrix: list[list[list[int]]],
@@ -643,34 +2214,93 @@ def tune(
     non_fallback: list[int],
     fallback: list[int],
     target_probs: list[float],
-) -> tuple[dict, dict]:
-    start = time.monotonic()
-    deadline = start + float(CONFIG["MAX_SECONDS"])
-    rng = random.Random(int(CONFIG["SEED"]))
-
-    current_matrix = clone_matrix(matrix)
-    current_eval = evaluate_candidate(
-        current_matrix,
-        len(dimensions),
-        results,
-        non_fallback,
-        fallback,
-        target_probs,
-        int(CONFIG["SEED"]),
-    )
-    best_matrix = clone_matrix(current_matrix)
-    best_eval = current_eval
+    label: str = "",
+) -> dict:
+    return {
+        "label": label,
+        "dimensions": dimensions,
+        "questionsFile": questions_file,
+        "baseMatrix": matrix,
+        "results": results,
+        "nonFallback": non_fallback,
+        "fallback": fallback,
+        "targetProbs": target_probs,
+        "rng": random.Random(int(CONFIG["SEED"])),
+        "scheduler": create_search_scheduler(non_fallback),
+        "surrogate": create_surrogate(results, non_fallback),
+        "transposition": create_transposition_table(matrix),
+        # currentMatrix is edited in place; the best state and history are kept as deltas against baseMatrix
+        "currentMatrix": clone_matrix(matrix),
+        "currentEval": None,
+        "currentHash": 0,
+        "currentDelta": {},
+        "bestDelta": {},
+        "bestAttempt": 0,
+        "bestEval": None,
+        "deltaLog": [],
+        "attempt": 0,
+        "stagnation": 0,
+        "temperature": 1.0,
+        "stopReason": None,
+        "activeSeconds": 0.0,
+        "slices": 0,
+        "kernelBackend": None,
+    }
 
-    print(
-        "Initial",
-        f"reach={pct(best_eval['reachability']['reachability'])}",
-        f"({best_eval['reachability']['foundCount']}/{best_eval['reachability']['totalCount']})",
-    )
 
-    attempt = 0
-    stagnation = 0
-    temperature = 1.0
-    stop_reason = "unknown"
+def run_tuning_slice(state: dict, slice_seconds: float | None = None) -> bool:
+    slice_start = time.monotonic()
+    slice_end = slice_start + slice_seconds if slice_seconds is not None else None
+    deadline = slice_start + float(CONFIG["MAX_SECONDS"]) - state["activeSeconds"]
+    tag = [f"[{state['label']}]"] if state["label"] else []
+
+    dimensions = state["dimensions"]
+    matrix = state["baseMatrix"]
+    results = state["results"]
+    non_fallback = state["nonFallback"]
+    fallback = state["fallback"]
+    target_probs = state["targetProbs"]
+    rng = state["rng"]
+    scheduler = state["scheduler"]
+    surrogate = state["surrogate"]
+    transposition = state["transposition"]
+    current_matrix = state["currentMatrix"]
+    current_delta = state["currentDelta"]
+    delta_log = state["deltaLog"]
+
+    def elapsed() -> float:
+        return state["activeSeconds"] + time.monotonic() - slice_start
+
+    if state["currentEval"] is None:
+        state["currentEval"] = evaluate_candidate(
+            current_matrix,
+            len(dimensions),
+            results,
+            non_fallback,
+            fallback,
+            target_probs,
+            int(CONFIG["SEED"]),
+            scheduler,
+        )
+        state["bestEval"] = state["currentEval"]
+        if transposition is not None:
+            state["currentHash"] = transposition["rootHash"]
+            store_transposition(transposition, state["currentHash"], state["currentEval"])
+        print(
+            *tag,
+            "Initial",
+            f"reach={pct(state['bestEval']['reachability']['reachability'])}",
+            f"({state['bestEval']['reachability']['foundCount']}/{state['bestEval']['reachability']['totalCount']})",
+        )
+
+    current_eval = state["currentEval"]
+    current_hash = state["currentHash"]
+    best_eval = state["bestEval"]
+    attempt = state["attempt"]
+    slice_attempt = attempt
+    stagnation = state["stagnation"]
+    temperature = state["temperature"]
+    stop_reason = None
 
     while True:
         if goal_met(best_eval):
@@ -685,78 +2315,155 @@ def tune(
         if stagnation >= int(CONFIG["STAGNATION_PATIENCE"]):
             stop_reason = "stagnation_patience"
             break
+        # every slice makes at least one attempt, so a short slice cannot stall a variant
+        if slice_end is not None and attempt > slice_attempt and time.monotonic() >= slice_end:
+            break
 
         attempt += 1
-        candidate_matrix = clone_matrix(current_matrix)
-        mutate_weights(candidate_matrix, len(dimensions), rng)
-
-        candidate_eval = evaluate_candidate(
-            candidate_matrix,
-            len(dimensions),
-            results,
-            non_fallback,
-            fallback,
-            target_probs,
-            int(CONFIG["SEED"]) + attempt * 97,
-        )
+        predicted = None
+        if surrogate is not None:
+            edits, predicted = screen_weight_mutations(
+                surrogate,
+                current_matrix,
+                current_eval,
+                len(dimensions),
+                rng,
+                non_fallback,
+                fallback,
+                target_probs,
+            )
+        else:
+            edits = mutate_weights(current_matrix, len(dimensions), rng)
+
+        candidate_hash = 0
+        candidate_eval = None
+        if transposition is not None:
+            candidate_hash = update_matrix_hash(transposition, current_hash, edits)
+            candidate_eval = probe_transposition(transposition, candidate_hash)
+            if candidate_eval is not None:
+                candidate_eval = revisit_transposition_entry(
+                    transposition,
+                    candidate_eval,
+                    current_matrix,
+                    len(dimensions),
+                    results,
+                    non_fallback,
+                    fallback,
+                    target_probs,
+                    int(CONFIG["SEED"]) + attempt * 97,
+                    scheduler,
+                    edits,
+                )
+        if candidate_eval is None:
+            candidate_eval = evaluate_candidate(
+                current_matrix,
+                len(dimensions),
+                results,
+                non_fallback,
+                fallback,
+                target_probs,
+                int(CONFIG["SEED"]) + attempt * 97,
+                scheduler,
+                edits,
+                current_eval["reachability"]["foundCount"],
+            )
+        if transposition is not None:
+            store_transposition(transposition, candidate_hash, candidate_eval)
 
         better_current = compare_candidate(candidate_eval, current_eval) > 0
+        if surrogate is not None:
+            update_surrogate(surrogate, current_eval, candidate_eval, edits, predicted, better_current)
         delta = candidate_eval["score"] - current_eval["score"]
         accept = math.exp(clamp(delta / max(1.0, temperature * 1_000_000_000.0), -60.0, 60.0))
         if better_current or rng.random() < accept:
-            current_matrix = candidate_matrix
             current_eval = candidate_eval
+            current_hash = candidate_hash
+            record_weight_delta(current_delta, matrix, edits)
+            delta_log.extend([attempt, *edit] for edit in edits if edit[3] != edit[4])
+        else:
+            undo_weight_edits(current_matrix, edits)
 
         if compare_candidate(candidate_eval, best_eval) > 0:
-            best_matrix = clone_matrix(candidate_matrix)
+            # a new best always beats current, so it was accepted above and current_delta describes it
+            state["bestDelta"] = dict(current_delta)
+            state["bestAttempt"] = attempt
             best_eval = candidate_eval
             stagnation = 0
-            elapsed = time.monotonic() - start
             print(
-                f"Improved @{elapsed:.1f}s attempt={attempt}",
+                *tag,
+                f"Improved @{elapsed():.1f}s attempt={attempt}",
                 f"reach={pct(best_eval['reachability']['reachability'])}",
             )
             if best_eval.get("probability"):
                 p = best_eval["probability"]
                 print(
+                    *tag,
                     f"dist mae={pct(p['mae'])} rmse={pct(p['rmse'])} maxAbs={pct(p['maxAbs'])}",
                     f"fallback={pct(p['fallbackRate'])} noEligible={pct(p['noEligibleRate'])}",
                 )
         else:
             stagnation += 1
             if attempt % int(CONFIG["LOG_EVERY"]) == 0:
-                elapsed = time.monotonic() - start
                 print(
-                    f"Progress @{elapsed:.1f}s attempt={attempt}",
+                    *tag,
+                    f"Progress @{elapsed():.1f}s attempt={attempt}",
                     f"bestReach={pct(best_eval['reachability']['reachability'])}",
                     f"stagnation={stagnation}/{int(CONFIG['STAGNATION_PATIENCE'])}",
                 )
 
         temperature *= 0.997
 
+    state.update(
+        currentEval=current_eval,
+        currentHash=current_hash,
+        bestEval=best_eval,
+        attempt=attempt,
+        stagnation=stagnation,
+        temperature=temperature,
+        stopReason=stop_reason,
+        activeSeconds=elapsed(),
+        slices=state["slices"] + 1,
+        kernelBackend=kernel_backend_report(results),
+    )
+    return stop_reason is not None
+
+
+def finish_tuning(state: dict) -> tuple[dict, dict]:
+    matrix = state["baseMatrix"]
+    best_eval = state["bestEval"]
+    best_delta = state["bestDelta"]
     reached = goal_met(best_eval)
     use_best = reached or bool(CONFIG["WRITE_BEST_IF_NOT_MET"])
-    final_matrix = best_matrix if use_best else matrix
-    final_eval = best_eval if use_best else current_eval
+    final_matrix = apply_weight_delta(matrix, best_delta) if use_best else matrix
+    final_eval = best_eval if use_best else state["currentEval"]
 
-    tuned_questions = matrix_to_questions_file(questions_file, final_matrix, dimensions)
+    tuned_questions = matrix_to_questions_file(state["questionsFile"], final_matrix, state["dimensions"])
     summary = {
         "stoppedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        "elapsedSeconds": time.monotonic() - start,
-        "stopReason": stop_reason,
-        "attempts": attempt,
+        "elapsedSeconds": state["activeSeconds"],
+        "stopReason": state["stopReason"] or "unknown",
+        "attempts": state["attempt"],
         "reachedTarget": reached,
         "selectionMode": "best_candidate" if use_best else "original_matrix",
         "targetReachability": CONFIG["TARGET_REACHABILITY"],
         "probabilityTolerance": CONFIG["PROBABILITY_TOLERANCE"],
+        "kernelBackend": state["kernelBackend"] or kernel_backend_report(state["results"]),
+        "searchBudget": summarize_search_scheduler(state["scheduler"], state["results"]),
+        "surrogate": summarize_surrogate(state["surrogate"]),
+        "transposition": summarize_transposition_table(state["transposition"]),
+        "history": {
+            "bestAttempt": state["bestAttempt"] if use_best else 0,
+            "bestDelta": [[qi, oi, di, v] for (qi, oi, di), v in sorted(best_delta.items())] if use_best else [],
+            "acceptedEdits": len(state["deltaLog"]),
+            # rows of [attempt, qi, oi, di, old, new]; replay_delta_log rebuilds any accepted state
+            "deltaLog": state["deltaLog"],
+        },
         "best": final_eval,
     }
     return tuned_questions, summary
 
 
-def main() -> None:
-    dims_payload, questions_payload, results_payload = read_json_payloads()
-
+def prepare_dataset(dims_payload: dict, questions_payload: dict, results_payload: dict) -> dict:
     dimensions = [d["id"] for d in dims_payload.get("dimensions", [])]
     if not dimensions:
         raise ValueError("No dimensions found.")
@@ -791,31 +2498,36 @@ def main() -> None:
         raise ValueError("No non-fallback classes found.")
 
     target_probs, fallback_target = build_target_probabilities(results, non_fallback, fallback)
-    target_map = {results[i]["id"]: target_probs[i] for i in range(len(results))}
+    return {
+        "dimensions": dimensions,
+        "questionsFile": questions_payload,
+        "matrix": matrix,
+        "results": results,
+        "nonFallback": non_fallback,
+        "fallback": fallback,
+        "targetProbs": target_probs,
+        "fallbackTarget": fallback_target,
+    }
 
-    print("Tuner started")
-    print(
-        "mode=" + ("dataiku" if is_dataiku_mode() else "local"),
-        f"targetReach={pct(float(CONFIG['TARGET_REACHABILITY']))}",
-        f"maxSeconds={CONFIG['MAX_SECONDS']}",
-        f"maxIterations={CONFIG['MAX_ITERATIONS']}",
-        f"stagnationPatience={CONFIG['STAGNATION_PATIENCE']}",
-    )
-    print(f"targetFallbackRate={pct(fallback_target)}")
-    print("targetDistributionByClass=", json.dumps(target_map, indent=2))
 
-    tuned_questions, summary = tune(
-        dimensions,
-        questions_payload,
-        matrix,
-        results,
-        non_fallback,
-        fallback,
-        target_probs,
+def start_dataset_tuning(dataset: dict, label: str = "") -> dict:
+    return start_tuning(
+        dataset["dimensions"],
+        dataset["questionsFile"],
+        dataset["matrix"],
+        dataset["results"],
+        dataset["nonFallback"],
+        dataset["fallback"],
+        dataset["targetProbs"],
+        label,
     )
 
+
+def print_best(summary: dict, label: str = "") -> None:
+    tag = [f"[{label}]"] if label else []
     best = summary["best"]
     print(
+        *tag,
         "Best",
         f"reach={pct(best['reachability']['reachability'])}",
         f"stopReason={summary['stopReason']}",
@@ -824,10 +2536,199 @@ def main() -> None:
     if best.get("probability"):
         p = best["probability"]
         print(
+            *tag,
             f"distribution mae={pct(p['mae'])} rmse={pct(p['rmse'])} maxAbs={pct(p['maxAbs'])}",
             f"fallback={pct(p['fallbackRate'])} minNonFallback={pct(p['minNonFallbackRate'])} noEligible={pct(p['noEligibleRate'])}",
         )
 
+
+@contextlib.contextmanager
+def config_overrides(overrides: dict):
+    unknown = [k for k in overrides if k not in CONFIG]
+    if unknown:
+        raise ValueError(f"Unknown CONFIG keys in overrides: {', '.join(sorted(unknown))}")
+    saved = dict(CONFIG)
+    CONFIG.update(overrides)
+    try:
+        yield
+    finally:
+        CONFIG.clear()
+        CONFIG.update(saved)
+
+
+def is_batch_mode() -> bool:
+    if is_dataiku_mode():
+        return bool(CONFIG["BATCH_MANIFEST_FILE"])
+    return bool(CONFIG["LOCAL_BATCH_MANIFEST_PATH"])
+
+
+def load_batch_variants() -> list[dict]:
+    manifest = read_json_input(CONFIG["BATCH_MANIFEST_FILE"], CONFIG["LOCAL_BATCH_MANIFEST_PATH"])
+    base_dir = os.path.dirname(CONFIG["LOCAL_BATCH_MANIFEST_PATH"])
+    variants = []
+    seen = set()
+    for i, entry in enumerate(manifest.get("variants", [])):
+        variant_id = str(entry.get("id") or f"variant-{i + 1}")
+        if variant_id in seen:
+            raise ValueError(f"Duplicate variant id in manifest: {variant_id}")
+        seen.add(variant_id)
+
+        names = {
+            "dimensions": entry.get("dimensions", CONFIG["DIMENSIONS_FILE"]),
+            "questions": entry.get("questions", CONFIG["QUESTIONS_FILE"]),
+            "results": entry.get("results", CONFIG["RESULTS_FILE"]),
+        }
+        dataset = prepare_dataset(
+            *(read_json_input(names[k], os.path.join(base_dir, names[k])) for k in ("dimensions", "questions", "results"))
+        )
+        variants.append({"id": variant_id, "config": dict(entry.get("config") or {}), "files": names, "dataset": dataset})
+
+    if not variants:
+        raise ValueError("Batch manifest has no variants.")
+    return variants
+
+
+def run_batch_slice(state: dict, config: dict, slice_seconds: float) -> dict:
+    # workers get the full merged CONFIG so this also holds under the spawn start method
+    with config_overrides(config):
+        # no-op when the parity verdict was inherited from the parent; spawned workers check once per ruleset
+        init_kernel_backend(state["baseMatrix"], len(state["dimensions"]), state["results"])
+        run_tuning_slice(state, slice_seconds)
+    return state
+
+
+def run_batch() -> None:
+    started = time.monotonic()
+    variants = load_batch_variants()
+    workers = int(CONFIG["BATCH_WORKERS"]) or (os.cpu_count() or 1)
+    workers = max(1, min(workers, len(variants)))
+    slice_seconds = float(CONFIG["BATCH_SLICE_SECONDS"])
+    slice_seconds = slice_seconds if slice_seconds > 0 else None
+
+    rulesets: dict[str, list[str]] = {}
+    backends = {}
+    for v in variants:
+        dataset = v["dataset"]
+        rulesets.setdefault(ruleset_digest(dataset["results"]), []).append(v["id"])
+        # warm the shared evaluator cache in this process so forked workers inherit it; the parity
+        # check also runs every kernel once, so workers start with them compiled
+        with config_overrides(v["config"]):
+            backends[v["id"]] = init_kernel_backend(dataset["matrix"], len(dataset["dimensions"]), dataset["results"])
+            prepare_ruleset(dataset["results"])
+
+    print("Batch tuner started")
+    print(
+        "mode=" + ("dataiku" if is_dataiku_mode() else "local"),
+        f"variants={len(variants)}",
+        f"rulesets={len(rulesets)}",
+        f"workers={workers}",
+        f"sliceSeconds={slice_seconds}",
+    )
+    for vid, kernels in backends.items():
+        print(f"[{vid}] kernelBackend={kernels['name']} ({kernels['reason']}) searchEngine={kernels['search']}")
+
+    configs = {}
+    states = {}
+    for v in variants:
+        with config_overrides(v["config"]):
+            configs[v["id"]] = dict(CONFIG)
+            states[v["id"]] = start_dataset_tuning(v["dataset"], v["id"])
+
+    report_rows = {}
+
+    def complete(variant: dict) -> None:
+        state = states[variant["id"]]
+        with config_overrides(variant["config"]):
+            tuned_questions, summary = finish_tuning(state)
+            summary["variant"] = {"id": variant["id"], "files": variant["files"], "config": variant["config"]}
+            print_best(summary, variant["id"])
+            write_outputs(tuned_questions, summary, variant["id"] + "/")
+            outputs = [variant["id"] + "/" + CONFIG["OUTPUT_QUESTIONS_FILE"], variant["id"] + "/" + CONFIG["OUTPUT_SUMMARY_FILE"]]
+        best = summary["best"]
+        report_rows[variant["id"]] = {
+            "id": variant["id"],
+            "files": variant["files"],
+            "config": variant["config"],
+            "ruleset": ruleset_digest(variant["dataset"]["results"]),
+            "kernelBackend": summary["kernelBackend"],
+            "outputs": outputs,
+            "stopReason": summary["stopReason"],
+            "reachedTarget": summary["reachedTarget"],
+            "attempts": summary["attempts"],
+            "slices": state["slices"],
+            "activeSeconds": state["activeSeconds"],
+            "reachability": best["reachability"]["reachability"],
+            "missingIds": best["reachability"]["missingIds"],
+            "maxAbs": best["probability"]["maxAbs"] if best.get("probability") else None,
+        }
+
+    # round-robin slices: a variant goes to the back of the queue after each slice
+    by_id = {v["id"]: v for v in variants}
+    queue = collections.deque(v["id"] for v in variants)
+    if workers == 1:
+        while queue:
+            vid = queue.popleft()
+            states[vid] = run_batch_slice(states[vid], configs[vid], slice_seconds)
+            if states[vid]["stopReason"] is None:
+                queue.append(vid)
+            else:
+                complete(by_id[vid])
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = {}
+            while queue or in_flight:
+                while queue and len(in_flight) < workers:
+                    vid = queue.popleft()
+                    in_flight[pool.submit(run_batch_slice, states[vid], configs[vid], slice_seconds)] = vid
+                done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    vid = in_flight.pop(future)
+                    states[vid] = future.result()
+                    if states[vid]["stopReason"] is None:
+                        queue.append(vid)
+                    else:
+                        complete(by_id[vid])
+
+    report = {
+        "stoppedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "elapsedSeconds": time.monotonic() - started,
+        "workers": workers,
+        "sliceSeconds": slice_seconds,
+        "rulesets": rulesets,
+        "variants": [report_rows[v["id"]] for v in variants],
+    }
+    write_json_output(CONFIG["OUTPUT_BATCH_REPORT_FILE"], report)
+    print(f"Wrote {len(variants)} variant outputs and {CONFIG['OUTPUT_BATCH_REPORT_FILE']}")
+
+
+def main() -> None:
+    if is_batch_mode():
+        run_batch()
+        return
+
+    dataset = prepare_dataset(*read_json_payloads())
+    results = dataset["results"]
+    target_probs = dataset["targetProbs"]
+    kernels = init_kernel_backend(dataset["matrix"], len(dataset["dimensions"]), results)
+    target_map = {results[i]["id"]: target_probs[i] for i in range(len(results))}
+
+    print("Tuner started")
+    print(
+        "mode=" + ("dataiku" if is_dataiku_mode() else "local"),
+        f"targetReach={pct(float(CONFIG['TARGET_REACHABILITY']))}",
+        f"maxSeconds={CONFIG['MAX_SECONDS']}",
+        f"maxIterations={CONFIG['MAX_ITERATIONS']}",
+        f"stagnationPatience={CONFIG['STAGNATION_PATIENCE']}",
+    )
+    print(f"targetFallbackRate={pct(dataset['fallbackTarget'])}")
+    print(f"kernelBackend={kernels['name']} ({kernels['reason']}) searchEngine={kernels['search']}")
+    print("targetDistributionByClass=", json.dumps(target_map, indent=2))
+
+    state = start_dataset_tuning(dataset)
+    run_tuning_slice(state)
+    tuned_questions, summary = finish_tuning(state)
+    print_best(summary)
+
     write_outputs(tuned_questions, summary)
 
     if is_dataiku_mode():